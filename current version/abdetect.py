@@ -1,19 +1,10 @@
-import pywinauto
 import threading
-import time
 import tkinter as tk
-from tkinter import scrolledtext, ttk, messagebox
-import sys
-import os
-import json
+from tkinter import scrolledtext, ttk
 
-# --- Local JSON Path ---
-if getattr(sys, 'frozen', False):
-    BASE_DIR = os.path.dirname(sys.executable)
-else:
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-MOBS_JSON_PATH = os.path.join(BASE_DIR, "json", "mobs.json")
+import dataloader
+import perf
+import tasks
 
 # --- ASCII Art ---
 ASCII_ART = """
@@ -23,58 +14,198 @@ ASCII_ART = """
 |/__\\|/__\\|/__\\|/__\\|/__\\|/__\\|/__\\|/__\\|/__\\|
 """
 
-# --- Load JSON ---
-def load_mobs():
-    """Fetch the mobs JSON from the local json directory."""
-    try:
-        with open(MOBS_JSON_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error loading JSON: {e}\nFile expected at:\n{MOBS_JSON_PATH}")
-        return {}
+# --- Scan Monsters ---
+EXCLUDED_CONTROL_IDS = [67742]
+EXCLUDED_TEXTS = ["Pine Apple"]
+UI_KEYWORDS = [
+    "HP:", "Gold:", "Ready", "Amount:", "Exp:", "Level:", "Hits:", "Mort",
+    "Professions", "Skills/Spells", "Quests", "FP:", "ST:", "AD:", "Magic:",
+    "Armor:", "STR", "WIS", "CHR", "END", "INT", "AGI", "Additional Bonuses"
+]
+
+def filter_monsters(controls, mobs_data):
+    """Return {name: mob info} for the visible controls whose text names a known monster."""
+    filtered_controls = [
+        ctrl
+        for ctrl in controls
+        if ctrl.control_id() not in EXCLUDED_CONTROL_IDS and ctrl.window_text().strip() not in EXCLUDED_TEXTS
+    ]
+    monster_names = [ctrl.window_text().strip() for ctrl in filtered_controls]
+    filtered_names = {
+        name for name in monster_names if name and not any(keyword in name for keyword in UI_KEYWORDS) and not any(ch.isdigit() for ch in name)
+    }
+    return {name: mobs_data.get(name, {}) for name in filtered_names if name in mobs_data}
 
-mobs_data = load_mobs()
+def scan_tick(window, mobs_data, wait):
+    """
+    One scan of the game window. wait(seconds) sleeps and returns True when interrupted.
 
-# --- Scan Monsters ---
-def scan_monsters(window, update_gui):
-    """Scan for monsters and update the GUI."""
+    Returns:
+        dict: matching monsters, or None if the scan was interrupted (pause/stop).
+    """
+    # A tick runs from enumerating the controls to the match result (including the settle wait)
+    with perf.span("detect.scan_tick"):
+        controls = [ctrl for ctrl in window.children() if "STATIC" in ctrl.class_name() and ctrl.is_visible()]
+        perf.count("detect.controls_per_tick", len(controls))
+        if wait(SETTLE_DELAY):
+            return None
+        with perf.span("detect.match"):
+            return filter_monsters(controls, mobs_data)
+
+# --- Detector Service ---
+# The detector runs on the io pool and sleeps on a single Event, so every state change
+# (pause, resume, stop, an observer coming or going) wakes it immediately. While paused or
+# unobserved it blocks with no timeout (no CPU at all); while the game is minimized or closed
+# it only makes a cheap check every few seconds.
+GAME_TITLE_RE = "Ember Online - .*"
+SCAN_INTERVAL = 2        # Seconds between scans
+SETTLE_DELAY = 0.1       # Seconds between listing the controls and reading their text
+MINIMIZED_POLL = 2       # Seconds between checks while the game is minimized
+REATTACH_INTERVAL = 5    # Seconds between looks for the game window while it is closed
+
+def find_game_window():
+    """Return the Ember Online window, or None if the game isn't running."""
+    import pywinauto  # Heavy; only needed once the detector starts
+    windows = pywinauto.findwindows.find_windows(title_re=GAME_TITLE_RE)
+    if not windows:
+        return None
+    app = pywinauto.Application().connect(handle=windows[0])
+    return app.window(handle=windows[0])
+
+def create_detector(mobs_data, on_update, on_status, find_window=find_game_window):
+    """
+    Create a detector (stopped). on_update(monsters) and on_status(text) are called from the
+    detector thread; wrap them with tasks.call_soon to touch widgets.
+    """
+    return {
+        "mobs": mobs_data,
+        "on_update": on_update,
+        "on_status": on_status,
+        "find_window": find_window,
+        "paused": False,
+        "stopping": False,
+        "observers": set(),
+        "wake": threading.Event(),
+        "future": None,
+    }
+
+def run_detector(detector):
+    """Detector loop: scan while observed and the game is up, sleep otherwise, exit on stop."""
+    wake = detector["wake"]
+    window = None
     previous_monsters = set()
+    status = [None]
+
+    def set_status(text):
+        if text != status[0]:
+            status[0] = text
+            detector["on_status"](text)
+
     while True:
-        controls = [ctrl for ctrl in window.children() if "STATIC" in ctrl.class_name() and ctrl.is_visible()]
-        time.sleep(0.1)
-        excluded_control_ids = [67742]
-        excluded_texts = ["Pine Apple"]
-        filtered_controls = [
-            ctrl
-            for ctrl in controls
-            if ctrl.control_id() not in excluded_control_ids and ctrl.window_text().strip() not in excluded_texts
-        ]
-        monster_names = [ctrl.window_text().strip() for ctrl in filtered_controls]
-        ui_keywords = [
-            "HP:", "Gold:", "Ready", "Amount:", "Exp:", "Level:", "Hits:", "Mort",
-            "Professions", "Skills/Spells", "Quests", "FP:", "ST:", "AD:", "Magic:",
-            "Armor:", "STR", "WIS", "CHR", "END", "INT", "AGI", "Additional Bonuses"
-        ]
-        filtered_names = {
-            name for name in monster_names if name and not any(keyword in name for keyword in ui_keywords) and not any(ch.isdigit() for ch in name)
-        }
-        matching_monsters = {name: mobs_data.get(name, {}) for name in filtered_names if name in mobs_data}
+        wake.clear()  # Clear before reading the flags so no change is missed
+        if detector["stopping"]:
+            break
+        if detector["paused"]:
+            set_status("Paused")
+            wake.wait()
+            continue
+        if not detector["observers"]:
+            set_status("Paused (not visible)")
+            wake.wait()
+            continue
+
+        if window is None:
+            try:
+                window = detector["find_window"]()
+            except Exception as e:
+                set_status(f"Error finding the game window: {e}")
+                wake.wait(REATTACH_INTERVAL)
+                continue
+            if window is None:
+                set_status("Waiting for the Ember Online window...")
+                wake.wait(REATTACH_INTERVAL)
+                continue
+
+        try:
+            if window.is_minimized():
+                set_status("Paused (game minimized)")
+                wake.wait(MINIMIZED_POLL)
+                continue
+            set_status("Scanning")
+            matching_monsters = scan_tick(window, detector["mobs"], wake.wait)
+        except Exception:
+            # The game closed or restarted: forget the window and look for a new one
+            window = None
+            if previous_monsters:
+                previous_monsters = set()
+                detector["on_update"]({})
+            set_status("Game window lost; waiting for it to return...")
+            wake.wait(REATTACH_INTERVAL)  # An error that persists must not turn into a busy loop
+            continue
+        if matching_monsters is None:
+            continue  # Interrupted by a pause or stop
         if matching_monsters.keys() != previous_monsters:
             previous_monsters = matching_monsters.keys()
-            update_gui(matching_monsters)
-        time.sleep(2)
+            detector["on_update"](matching_monsters)
+        wake.wait(SCAN_INTERVAL)
+
+    set_status("Stopped")
+
+def start_detector(detector):
+    """Start the detector thread (no-op if it is already running); returns False if the pool refused it."""
+    future = detector["future"]
+    if future is not None and not future.done():
+        return True
+    detector["stopping"] = False
+    detector["future"] = tasks.submit("io", run_detector, detector)
+    if detector["future"] is None:
+        detector["on_status"]("Background tasks busy; retrying...")
+        return False
+    return True
+
+def pause_detector(detector):
+    detector["paused"] = True
+    detector["wake"].set()
+
+def resume_detector(detector):
+    detector["paused"] = False
+    detector["wake"].set()
+
+def stop_detector(detector):
+    """Ask the detector thread to exit; it wakes at once and stops within one settle delay."""
+    detector["stopping"] = True
+    detector["wake"].set()
+
+def set_observed(detector, observer, observed):
+    """Record whether an observer (e.g. the Detect tab) is watching; unobserved detectors sleep."""
+    if observed:
+        detector["observers"].add(observer)
+    else:
+        detector["observers"].discard(observer)
+    detector["wake"].set()
 
 # --- Create Detector Tab ---
 def create_detect_tab(parent):
     """Creates the Detect tab in the GUI."""
     tab_detector = ttk.Frame(parent, style="Dark.TFrame")
     parent.add(tab_detector, text="🧪 Detect")
+    build_detect_tab(tab_detector)
+
+def build_detect_tab(tab_detector):
+    """Builds the Detect tab's widgets inside an existing frame."""
     style = ttk.Style()
     style.configure("Dark.TFrame", background="#000000")
     style.configure("Dark.TLabel", background="#000000", foreground="#00FF00", font=("Lucida Console", 11))
     style.configure("Dark.TButton", background="#00FF00", foreground="#000000", font=("Lucida Console", 10))
     frame = tk.Frame(tab_detector, bg="#000000")
     frame.pack(fill="both", expand=True)
+    status_frame = tk.Frame(frame, bg="#000000")
+    status_frame.pack(fill="x", padx=10, pady=(10, 0))
+    status_label = tk.Label(status_frame, text="Loading...", font=("Lucida Console", 10), fg="#00FF00", bg="#000000")
+    status_label.pack(side="left")
+    pause_button = tk.Button(status_frame, text="⏸ Pause", bg="#555555", fg="#00FF00", font=("Lucida Console", 10),
+                             command=lambda: toggle_pause())
+    pause_button.pack(side="right")
     text_area = scrolledtext.ScrolledText(
         frame, wrap=tk.WORD, font=("Lucida Console", 12), fg="#00FF00", bg="#000000", insertbackground="#00FF00"
     )
@@ -82,6 +213,7 @@ def create_detect_tab(parent):
     text_area.config(state=tk.NORMAL)
     text_area.insert(tk.END, ASCII_ART)
     text_area.config(state=tk.DISABLED)
+    @perf.timed("render.detect")
     def update_gui(monster_data):
         text_area.config(state=tk.NORMAL)
         text_area.delete("1.0", tk.END)
@@ -96,21 +228,53 @@ def create_detect_tab(parent):
         else:
             text_area.insert(tk.END, ASCII_ART)
         text_area.config(state=tk.DISABLED)
-    try:
-        windows = pywinauto.findwindows.find_windows(title_re="Ember Online - .*")
-        if windows:
-            app = pywinauto.Application().connect(handle=windows[0])
-            window = app.window(handle=windows[0])
-            threading.Thread(target=scan_monsters, args=(window, update_gui), daemon=True).start()
-        else:
-            text_area.config(state=tk.NORMAL)
-            text_area.insert(tk.END, "Ember Online window not found!\n")
-            text_area.config(state=tk.DISABLED)
-    except Exception as e:
+    def show_message(message):
         text_area.config(state=tk.NORMAL)
-        text_area.insert(tk.END, f"Error: {e}\n")
+        text_area.insert(tk.END, message)
         text_area.config(state=tk.DISABLED)
 
+    detector_state = {"detector": None}
+
+    def toggle_pause():
+        detector = detector_state["detector"]
+        if detector is None:
+            return
+        if detector["paused"]:
+            resume_detector(detector)
+            pause_button.config(text="⏸ Pause")
+        else:
+            pause_detector(detector)
+            pause_button.config(text="▶ Resume")
+
+    # Observed only while the tab is on screen (selected, and the app window not minimized)
+    def refresh_observed(event=None):
+        detector = detector_state["detector"]
+        if detector is not None and tab_detector.winfo_exists():
+            tab_detector.after_idle(lambda: tab_detector.winfo_exists() and
+                                    set_observed(detector, "tab", bool(tab_detector.winfo_viewable())))
+
+    def on_loaded(dataset):
+        detector = create_detector(
+            dataset["mobs"],
+            lambda data: tasks.call_soon(text_area, update_gui, data),
+            lambda text: tasks.call_soon(status_label, status_label.config, {"text": text})
+        )
+        detector_state["detector"] = detector
+        set_observed(detector, "tab", bool(tab_detector.winfo_viewable()))
+
+        def start():
+            if tab_detector.winfo_exists() and not detector["stopping"] and not start_detector(detector):
+                tab_detector.after(REATTACH_INTERVAL * 1000, start)
+
+        start()
+        for widget in (tab_detector, tab_detector.winfo_toplevel()):
+            widget.bind("<Map>", refresh_observed, add="+")
+            widget.bind("<Unmap>", refresh_observed, add="+")
+        tab_detector.bind("<Destroy>", lambda event: stop_detector(detector) if event.widget is tab_detector else None, add="+")
+
+    # Start the detector once the background loader has the mob data
+    dataloader.when_loaded(tab_detector, "mobs", on_loaded, lambda e: show_message(f"Error loading JSON: {e}\n"))
+
 # --- Main Function ---
 def main():
     root = tk.Tk()
@@ -120,8 +284,10 @@ def main():
     root.attributes("-topmost", True)
     notebook = ttk.Notebook(root)
     notebook.pack(expand=True, fill="both")
+    tasks.install(root)
     create_detect_tab(notebook)
     root.mainloop()
+    tasks.shutdown()
 
 if __name__ == "__main__":
     main()
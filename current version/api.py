@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+import crafting
+import dataloader
+import perf
+import tasks
+from bestiary import match_monsters
+from quest import filter_quests, parse_level_range
+
+# --- Local Query API ---
+# Optional HTTP/JSON server for overlays, bots and relays that can't drive the GUI. It runs
+# its own asyncio loop on a background thread (never the tk thread), reads the datasets the
+# background loader already built, and answers repeated queries from an LRU response cache.
+# Bound to localhost only. Start it with AUTOBEAST_API_PORT=8765 when launching gui.py, or
+# run "python api.py" on its own.
+#
+#   GET  /health
+#   GET  /mobs?name=&level=3-18&divinity=&type=&exact=1&limit=
+#   GET  /mobs/<name>
+#   GET  /loot?item=<item>
+#   GET  /quests?text=&id=&name=&giver=&level=&repeatable=1&limit=
+#   POST /craft?files=alchemy.txt,armor.txt&tiers=1,2   (body: inventory paste)
+API_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 100
+RESPONSE_CACHE_SIZE = 512
+CRAFT_CACHE_SIZE = 64
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+IDLE_TIMEOUT = 15  # Seconds a keep-alive connection may sit idle
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+# Encoded GET responses; only touched from the server's event loop
+response_cache = OrderedDict()
+# Crafting reports; only touched from the single "cpu" pool worker
+craft_cache = OrderedDict()
+server_state = {"loop": None, "server": None, "thread": None}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def cache_get(cache, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def cache_put(cache, key, value, size):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+async def get_dataset(name):
+    """Wait (without blocking the loop) for the background loader's dataset."""
+    try:
+        return await asyncio.wrap_future(dataloader.get_future(name))
+    except Exception as e:
+        raise ApiError(503, f"{name} data unavailable: {e}")
+
+def query_flag(query, key):
+    return query.get(key, "").lower() in ("1", "true", "yes")
+
+def query_limit(query):
+    try:
+        return max(0, int(query.get("limit", DEFAULT_LIMIT)))
+    except ValueError:
+        raise ApiError(400, "limit must be a number")
+
+def mob_record(name, info):
+    return dict(info, name=name)
+
+# --- Endpoints ---
+async def handle_health(query, body):
+    futures = {name: dataloader.get_future(name) for name in dataloader.DATASET_LOADERS}
+    return {"status": "ok", "datasets": {name: future.done() for name, future in futures.items()}}
+
+async def handle_mobs(query, body):
+    mobs = (await get_dataset("mobs"))["mobs"]
+    level = query.get("level", "").strip()
+    min_level, max_level = parse_level_range(level)
+    if level and min_level is None:
+        raise ApiError(400, "level must look like 3-18 or 12")
+    matches = match_monsters(query.get("name", ""), min_level, max_level, query.get("divinity", ""),
+                             query.get("type", ""), query_flag(query, "exact"), mobs)
+    matches.pop("Name", None)  # Header row
+    limit = query_limit(query)
+    return {"count": len(matches),
+            "mobs": [mob_record(name, info) for name, info in list(matches.items())[:limit]]}
+
+async def handle_mob(name, query, body):
+    dataset = await get_dataset("mobs")
+    key = dataset["name_index"].get(name.strip().lower())
+    if key is None:
+        raise ApiError(404, f"no mob named {name!r}")
+    return mob_record(key, dataset["mobs"][key])
+
+async def handle_loot(query, body):
+    item = query.get("item", "").strip()
+    if not item:
+        raise ApiError(400, "item is required")
+    dataset = await get_dataset("mobs")
+    names = dataset["loot"].get(item.lower(), [])
+    return {"item": item, "mobs": [
+        {"name": name, "Level": dataset["mobs"][name].get("Level"), "Location": dataset["mobs"][name].get("Location")}
+        for name in names
+    ]}
+
+async def handle_quests(query, body):
+    state = await get_dataset("quests")
+    results = filter_quests(query.get("id", ""), query.get("name", ""), query.get("giver", ""), query.get("level", ""),
+                            query_flag(query, "repeatable"), state["quests"], query.get("text", ""),
+                            state["search_index"])
+    limit = query_limit(query)
+    quests = []
+    for idx, quest in results[:limit]:
+        quests.append(dict(quest, hunting=[
+            {"target": target, "count": count, "mob": mob_name,
+             "level": info.get("Level") if info else None, "location": info.get("Location") if info else None}
+            for target, count, mob_name, info in state["join"][idx]
+        ]))
+    return {"count": len(results), "quests": quests}
+
+def crafting_response(raw_inventory, files, tier_selection):
+    """Crafting report for an inventory paste (runs on the cpu pool, which owns the crafting caches)."""
+    tiers, recipes, tier_index = crafting.parse_files(files)
+    # Recipe file signatures make the cache follow edits on disk
+    key = (raw_inventory, tuple(sorted(files.items())), tuple(sorted(tier_selection.items())),
+           tuple(crafting.parsed_file_cache.get(name, (None,))[0] for name in sorted(files)))
+    cached = cache_get(craft_cache, key)
+    if cached is not None:
+        return cached
+    errors = []
+    inventory = crafting.parse_inventory(raw_inventory, errors=errors)
+    report = crafting.crafting_report(tiers, crafting.filter_by_tiers(recipes, tier_selection, tier_index), inventory)
+    response = {
+        "craftable": {
+            # "quantity" is null for recipes limited only by excluded materials (unbounded)
+            name: {"quantity": None if details["quantity"] == float("inf") else details["quantity"],
+                   "recipe": details["recipe"]}
+            for name, details in report.items()
+        },
+        "skipped_lines": [{"line": number, "text": text, "reason": reason} for number, text, reason in errors],
+    }
+    cache_put(craft_cache, key, response, CRAFT_CACHE_SIZE)
+    return response
+
+async def handle_craft(query, body):
+    try:
+        raw_inventory = body.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        raise ApiError(400, "body must be UTF-8 text")
+    files = dict(crafting.selected_files)
+    if query.get("files"):
+        wanted = {name.strip() for name in query["files"].split(",")}
+        files = {name: name in wanted for name in files}
+    tier_selection = dict(crafting.selected_tiers)
+    if query.get("tiers"):
+        wanted = {f"Tier {tier.strip()}" for tier in query["tiers"].split(",")}
+        tier_selection = {tier: tier in wanted for tier in tier_selection}
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(tasks.get_pool("cpu"), crafting_response, raw_inventory, files, tier_selection)
+
+ROUTES = {
+    ("GET", "/health"): handle_health,
+    ("GET", "/mobs"): handle_mobs,
+    ("GET", "/loot"): handle_loot,
+    ("GET", "/quests"): handle_quests,
+    ("POST", "/craft"): handle_craft,
+}
+CACHED_PATHS = ("/mobs", "/loot", "/quests")
+
+async def dispatch(method, target, body):
+    """Route one request; returns (status, encoded JSON body)."""
+    url = urllib.parse.urlsplit(target)
+    path = url.path.rstrip("/") or "/"
+    query = dict(urllib.parse.parse_qsl(url.query))
+    cacheable = method == "GET" and (path in CACHED_PATHS or path.startswith("/mobs/"))
+    cache_key = (path, tuple(sorted(query.items())))
+    if cacheable:
+        cached = cache_get(response_cache, cache_key)
+        if cached is not None:
+            return 200, cached
+    try:
+        if path.startswith("/mobs/"):
+            if method != "GET":
+                raise ApiError(405, "use GET")
+            payload = await handle_mob(urllib.parse.unquote(path[len("/mobs/"):]), query, body)
+        else:
+            handler = ROUTES.get((method, path))
+            if handler is None:
+                allowed = [m for m, p in ROUTES if p == path]
+                raise ApiError(405 if allowed else 404, f"use {allowed[0]}" if allowed else f"unknown path {path}")
+            payload = await handler(query, body)
+    except ApiError as e:
+        return e.status, json.dumps({"error": str(e)}).encode("utf-8")
+    except Exception as e:
+        print(f"Error handling {method} {target}: {e}")
+        return 500, json.dumps({"error": str(e)}).encode("utf-8")
+    encoded = json.dumps(payload).encode("utf-8")
+    if cacheable:
+        cache_put(response_cache, cache_key, encoded, RESPONSE_CACHE_SIZE)
+    return 200, encoded
+
+# --- HTTP Server ---
+def encode_response(status, body, keep_alive):
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+async def handle_connection(reader, writer):
+    """Serve HTTP/1.1 requests on one connection until it closes or idles out."""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                break
+            start = time.perf_counter()
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+            except ValueError:
+                writer.write(encode_response(400, b'{"error": "malformed request"}', False))
+                break
+            if length > MAX_BODY_BYTES:
+                writer.write(encode_response(413, b'{"error": "body too large"}', False))
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            status, payload = await dispatch(method.upper(), target, body)
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+            perf.record("api.request", time.perf_counter() - start)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host=API_HOST, port=DEFAULT_PORT, ready=None):
+    """Run the server on the current event loop until it is closed."""
+    server = await asyncio.start_server(handle_connection, host, port, limit=MAX_HEADER_BYTES, backlog=512)
+    server_state["loop"] = asyncio.get_running_loop()
+    server_state["server"] = server
+    print(f"Query API listening on http://{host}:{server.sockets[0].getsockname()[1]}")
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+
+def start_in_background(host=API_HOST, port=DEFAULT_PORT):
+    """Start the server on its own thread (datasets come from the shared background loader)."""
+    if server_state["thread"] is not None:
+        return server_state["thread"]
+    dataloader.start_loading()
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(serve(host, port, ready)), name="query-api", daemon=True)
+    server_state["thread"] = thread
+    thread.start()
+    ready.wait(5)
+    return thread
+
+def stop():
+    """Close the background server, if running."""
+    loop, server = server_state["loop"], server_state["server"]
+    if loop is not None and server is not None:
+        loop.call_soon_threadsafe(server.close)
+    server_state.update(loop=None, server=None, thread=None)
+
+# --- Main Function ---
+def main():
+    parser = argparse.ArgumentParser(description="Serve Autobeast data over a local HTTP/JSON API.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    dataloader.start_loading()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tasks.shutdown()
+
+if __name__ == "__main__":
+    main()
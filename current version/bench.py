@@ -0,0 +1,296 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import abdetect
+import bestiary
+import crafting
+import quest
+import synthdata
+
+# --- Benchmark Settings ---
+DEFAULT_SCALES = (1, 10, 100)
+REPEATS = 5
+RESULTS_DIR = "bench_results"
+REGRESSION_THRESHOLD = 1.25  # A case this many times slower than the baseline is reported as a regression
+
+# Fixed-size crafting_report case, independent of --scale: 10k recipes against a 1k-material inventory
+FIXED_RECIPE_COUNT = 10000
+FIXED_MATERIAL_COUNT = 1000
+
+# --- Headless Stand-ins ---
+# The search functions write into tk widgets; these take their calls without a display.
+class FakeText:
+    def __init__(self):
+        self.length = 0
+
+    def config(self, **options):
+        pass
+
+    def delete(self, *args):
+        self.length = 0
+
+    def insert(self, index, text):
+        self.length += len(text)
+
+
+class FakeButton:
+    def pack(self, **options):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def config(self, **options):
+        pass
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class FakeMessagebox:
+    """Swallows the search functions' dialogs (e.g. "No matching monsters found")."""
+
+    def showwarning(self, *args, **options):
+        pass
+
+    def showerror(self, *args, **options):
+        pass
+
+    def showinfo(self, *args, **options):
+        pass
+
+
+class FakeControl:
+    """A pywinauto-like control built from a synthdata control record."""
+
+    def __init__(self, record):
+        self.record = record
+
+    def class_name(self):
+        return self.record["class_name"]
+
+    def is_visible(self):
+        return self.record["visible"]
+
+    def control_id(self):
+        return self.record["control_id"]
+
+    def window_text(self):
+        return self.record["text"]
+
+
+def best_time(func, repeats=REPEATS):
+    """Return the fastest of several runs of func, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+# --- Cases ---
+def build_cases(data_dir):
+    """Return [(case name, func, repeats)] over the dataset in data_dir."""
+    with open(os.path.join(data_dir, "json", "mobs.json"), "r", encoding="utf-8") as f:
+        mobs = json.load(f)
+    with open(os.path.join(data_dir, "json", "quests.json"), "r", encoding="utf-8") as f:
+        quests = quest.flatten_quests(json.load(f))
+    with open(os.path.join(data_dir, "inventory.txt"), "r", encoding="utf-8") as f:
+        raw_inventory = f.read()
+    with open(os.path.join(data_dir, "controls.json"), "r", encoding="utf-8") as f:
+        controls = [FakeControl(record) for record in json.load(f)]
+
+    state = quest.build_quest_state(quests, mobs)
+    text, button = FakeText(), FakeButton()
+    all_files = {file_name: True for file_name in synthdata.RECIPE_FILES}
+    crafting.LOCAL_JSON_DIR = os.path.join(data_dir, "json")
+    tiers, recipes, tier_index = crafting.parse_files(all_files)
+    inventory = crafting.parse_inventory(raw_inventory)
+    line_cache = {}
+    crafting.parse_inventory(raw_inventory, line_cache)
+
+    def search_quests_text():
+        state["search_index"]["cache"].clear()  # Time the ranking, not the query cache
+        quest.search_quests("", "", "", "", False, text, quests, state["join"], state["chains"],
+                            text="helping gor", search_index=state["search_index"])
+
+    def parse_files_cold():
+        crafting.parsed_file_cache.clear()
+        crafting.parse_files(all_files)
+
+    def scan_filter():
+        # Same visibility pass scan_monsters does before filtering
+        visible = [ctrl for ctrl in controls if "STATIC" in ctrl.class_name() and ctrl.is_visible()]
+        abdetect.filter_monsters(visible, mobs)
+
+    numpy_module = crafting.load_numpy()
+
+    def crafting_report_python():
+        crafting.np = None
+        try:
+            crafting.crafting_report(tiers, recipes, inventory)
+        finally:
+            crafting.np = numpy_module
+
+    def crafting_report_numpy_cold():
+        crafting.requirement_matrix_cache.clear()
+        crafting.crafting_report(tiers, recipes, inventory)
+
+    cases = [
+        ("search_monster.name", lambda: bestiary.search_monster("gor", "", "", "", text, button, FakeVar(False), mobs), REPEATS),
+        ("search_monster.filters", lambda: bestiary.search_monster("", "20-60", "Fire", "Undead", text, button, FakeVar(False), mobs), REPEATS),
+        ("search_quests.filters", lambda: quest.search_quests("", "", "", "10-50", False, text, quests, state["join"], state["chains"]), REPEATS),
+        ("search_quests.text", search_quests_text, REPEATS),
+        ("parse_files.cold", parse_files_cold, REPEATS),
+        ("parse_files.warm", lambda: crafting.parse_files(all_files), REPEATS),
+        ("crafting_report.python", crafting_report_python, REPEATS),
+        ("parse_inventory.cold", lambda: crafting.parse_inventory(raw_inventory), REPEATS),
+        ("parse_inventory.cached", lambda: crafting.parse_inventory(raw_inventory, line_cache), REPEATS),
+        ("scan_monsters.filter", scan_filter, REPEATS),
+    ]
+    if numpy_module is not None:
+        cases.insert(7, ("crafting_report.numpy_cold", crafting_report_numpy_cold, 1))
+        cases.insert(8, ("crafting_report.numpy_warm", lambda: crafting.crafting_report(tiers, recipes, inventory), REPEATS))
+    return cases
+
+def make_fixed_crafting_data(recipe_count=FIXED_RECIPE_COUNT, material_count=FIXED_MATERIAL_COUNT, seed=1):
+    """Random recipes (2-6 materials each) and an inventory holding every material."""
+    rng = random.Random(seed)
+    materials = [f"Material {i}" for i in range(material_count)] + list(crafting.EXCLUDED_MATERIALS)
+    recipes = {
+        f"Recipe {i} Tier {i % 6 + 1}": {m: rng.randint(1, 5) for m in rng.sample(materials, rng.randint(2, 6))}
+        for i in range(recipe_count)
+    }
+    inventory = {m: rng.randint(0, 200) for m in materials}
+    return recipes, inventory
+
+def run_fixed(seed=1):
+    """Time crafting_report on the fixed 10k x 1k tables; returns {case: ms}."""
+    recipes, inventory = make_fixed_crafting_data(seed=seed)
+    numpy_module = crafting.load_numpy()
+
+    def python_loop():
+        crafting.np = None
+        try:
+            crafting.crafting_report({}, recipes, inventory)
+        finally:
+            crafting.np = numpy_module
+
+    def numpy_cold():
+        crafting.requirement_matrix_cache.clear()
+        crafting.crafting_report({}, recipes, inventory)
+
+    cases = [("crafting_report.python", python_loop, REPEATS)]
+    if numpy_module is not None:
+        cases.append(("crafting_report.numpy_cold", numpy_cold, 1))
+        cases.append(("crafting_report.numpy_warm", lambda: crafting.crafting_report({}, recipes, inventory), REPEATS))
+    results = {}
+    try:
+        for name, func, repeats in cases:
+            results[name] = round(best_time(func, repeats), 4)
+            print(f"  {name:28} {results[name]:10.3f} ms")
+    finally:
+        crafting.requirement_matrix_cache.clear()
+    return results
+
+def run_scale(scale, seed=1):
+    """Generate a dataset at scale and time every case on it; returns {case: ms}."""
+    local_json_dir = crafting.LOCAL_JSON_DIR
+    messageboxes = bestiary.messagebox, quest.messagebox
+    with tempfile.TemporaryDirectory(prefix="autobeast-bench-") as data_dir:
+        synthdata.generate_dataset(data_dir, scale, seed)
+        # A filter that matches nothing on some seeds would otherwise open a modal dialog
+        bestiary.messagebox = quest.messagebox = FakeMessagebox()
+        try:
+            results = {}
+            for name, func, repeats in build_cases(data_dir):
+                results[name] = round(best_time(func, repeats), 4)
+                print(f"  {name:28} {results[name]:10.3f} ms")
+        finally:
+            bestiary.messagebox, quest.messagebox = messageboxes
+            crafting.LOCAL_JSON_DIR = local_json_dir
+            crafting.parsed_file_cache.clear()
+            crafting.requirement_matrix_cache.clear()
+    return results
+
+# --- Results ---
+def save_results(results, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    stem = os.path.join(results_dir, f"bench-{time.strftime('%Y%m%d-%H%M%S')}")
+    path, attempt = f"{stem}.json", 1
+    while os.path.exists(path):
+        attempt += 1
+        path = f"{stem}-{attempt}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print current/baseline time ratios; returns the (scale, case) pairs that regressed."""
+    groups = [(f"x{scale}", cases, baseline.get("scales", {}).get(scale, {}))
+              for scale, cases in current["scales"].items()]
+    groups.append(("fixed", current.get("fixed", {}), baseline.get("fixed", {})))
+    regressions = []
+    for label, cases, previous in groups:
+        for name, ms in cases.items():
+            if name not in previous or not previous[name]:
+                continue
+            ratio = ms / previous[name]
+            flag = "REGRESSION" if ratio > threshold else ""
+            if flag:
+                regressions.append((label, name))
+            print(f"  {label:<7} {name:28} {previous[name]:10.3f} -> {ms:10.3f} ms  ({ratio:5.2f}x) {flag}")
+    return regressions
+
+# --- Main Function ---
+def main():
+    parser = argparse.ArgumentParser(description="Time Autobeast's hot paths on synthetic data (no display needed).")
+    parser.add_argument("--scale", type=float, nargs="+", default=list(DEFAULT_SCALES),
+                        help="dataset sizes as multiples of the current data (1-1000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--compare", metavar="RESULTS_JSON", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--no-fixed", action="store_true", help="skip the fixed 10k recipes x 1k materials case")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": crafting.load_numpy() is not None,
+        "seed": args.seed,
+        "scales": {},
+        "fixed": {},
+    }
+    for scale in args.scale:
+        print(f"Scale x{scale:g}:")
+        results["scales"][f"{scale:g}"] = run_scale(scale, args.seed)
+    if not args.no_fixed:
+        print(f"Fixed: {FIXED_RECIPE_COUNT} recipes x {FIXED_MATERIAL_COUNT} inventory materials:")
+        results["fixed"] = run_fixed(args.seed)
+    print(f"Results saved to {save_results(results, args.results_dir)}")
+
+    if baseline is not None:
+        print(f"Compared with {args.compare}:")
+        if compare_results(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
 import io
 import json
 
+import dataloader
+import httpclient
+import perf
+import tasks
+
 # --- JSON FILE PATH ---
-LOCAL_JSON_DIR = "json"
-MOBS_JSON_PATH = os.path.join(LOCAL_JSON_DIR, "mobs.json")
+LOCAL_JSON_DIR = dataloader.DATA_DIR
+MOBS_JSON_PATH = dataloader.MOBS_JSON_PATH
 
 # --- Load JSON ---
 def load_mobs():
@@ -20,59 +24,86 @@ def load_mobs():
         return {}
 
 # --- Open Map in New Window ---
+def fetch_map_image(map_url):
+    """Download and resize a map image (runs on the io pool; no tk calls here)."""
+    # Heavy imports are deferred until a map is actually opened
+    from PIL import Image
+
+    # Fetch the map image through the shared client (pooled connections, disk cache)
+    with perf.span("map.fetch"):
+        content = httpclient.get(map_url)
+
+    # Decode and resize the image to fit the window
+    with perf.span("map.decode"):
+        img = Image.open(io.BytesIO(content))
+        return img.resize((780, 780), Image.Resampling.LANCZOS)
+
+def show_map_window(img_resized):
+    """Shows a fetched map image in a new window."""
+    from PIL import ImageTk
+
+    # Create a new popup window
+    map_window = tk.Toplevel()
+    map_window.title("Monster Map")
+    map_window.geometry("800x800")
+    map_window.configure(bg="#000000")
+    map_window.grab_set()
+    tkimg = ImageTk.PhotoImage(img_resized)
+
+    # Display the image
+    map_label = tk.Label(map_window, image=tkimg, bg="#000000")
+    map_label.image = tkimg
+    map_label.pack(padx=10, pady=10, expand=True, fill="both")
+
+    # Add a Close button
+    close_button = tk.Button(
+        map_window,
+        text="Close",
+        command=map_window.destroy,
+        bg="#00FF00",
+        fg="#000000",
+        font=("Lucida Console", 12)
+    )
+    close_button.pack(pady=10)
+
 def open_map_window(map_url):
-    """Opens a new window to display the map."""
+    """Opens a new window to display the map once it has been fetched in the background."""
     if not map_url:
         messagebox.showerror("Error", "No map available for this monster.")
         return
 
-    try:
-        # Fetch the map image (still supports URL for now)
-        import requests
-        resp = requests.get(map_url, timeout=5)
-        resp.raise_for_status()
-        img = Image.open(io.BytesIO(resp.content))
-
-        # Create a new popup window
-        map_window = tk.Toplevel()
-        map_window.title("Monster Map")
-        map_window.geometry("800x800")
-        map_window.configure(bg="#000000")
-        map_window.grab_set()
-
-        # Resize the image to fit the window
-        img_resized = img.resize((780, 780), Image.Resampling.LANCZOS)
-        tkimg = ImageTk.PhotoImage(img_resized)
-
-        # Display the image
-        map_label = tk.Label(map_window, image=tkimg, bg="#000000")
-        map_label.image = tkimg
-        map_label.pack(padx=10, pady=10, expand=True, fill="both")
-
-        # Add a Close button
-        close_button = tk.Button(
-            map_window,
-            text="Close",
-            command=map_window.destroy,
-            bg="#00FF00",
-            fg="#000000",
-            font=("Lucida Console", 12)
-        )
-        close_button.pack(pady=10)
-
-    except Exception as e:
+    def failed(e):
         print(f"Error loading map image: {e}")
         messagebox.showerror("Error", "Failed to load the map.")
 
+    tasks.run_task(None, "io", fetch_map_image, map_url, on_done=show_map_window, on_error=failed)
+
 # --- Search Function ---
+def match_monsters(name, min_level, max_level, div, typ, exact, mobs_data):
+    """Return {name: info} for the mobs matching the criteria (min_level None means any level)."""
+    name_l = name.strip().lower()
+    candidates = {}
+    for n, info in mobs_data.items():
+        mob_level_raw = info.get("Level", "0")
+        mob_level = int(mob_level_raw) if isinstance(mob_level_raw, str) and mob_level_raw.isdigit() else 0
+
+        if (not name or name_l in n.lower()) and \
+           (min_level is None or (min_level <= mob_level <= max_level)) and \
+           (not div or div.strip() == info.get("Divinity", "")) and \
+           (not typ or typ.strip() == info.get("Type", "")):
+            candidates[n] = info
+
+    if exact:
+        candidates = {n: info for n, info in candidates.items() if n.lower() == name_l}
+    return candidates
+
+@perf.timed("search.bestiary")
 def search_monster(name, lvl_range, div, typ, search_results, map_button, exact_var, mobs_data):
     """Search for a monster based on the given criteria."""
     search_results.config(state=tk.NORMAL)
     search_results.delete("1.0", tk.END)
     map_button.pack_forget()  # Hide the map button initially
 
-    name_l = name.strip().lower()
-
     # Parse level range input
     min_level, max_level = None, None
     if "-" in lvl_range:
@@ -84,19 +115,7 @@ def search_monster(name, lvl_range, div, typ, search_results, map_button, exact_
     elif lvl_range.isdigit():
         min_level = max_level = int(lvl_range)
 
-    candidates = {}
-    for n, info in mobs_data.items():
-        mob_level_raw = info.get("Level", "0")
-        mob_level = int(mob_level_raw) if isinstance(mob_level_raw, str) and mob_level_raw.isdigit() else 0
-
-        if (not name or name_l in n.lower()) and \
-           (min_level is None or (min_level <= mob_level <= max_level)) and \
-           (not div or div.strip() == info.get("Divinity", "")) and \
-           (not typ or typ.strip() == info.get("Type", "")):
-            candidates[n] = info
-
-    if exact_var.get():
-        candidates = {n: info for n, info in candidates.items() if n.lower() == name_l}
+    candidates = match_monsters(name, min_level, max_level, div, typ, exact_var.get(), mobs_data)
 
     if candidates:
         for m, info in candidates.items():
@@ -122,12 +141,13 @@ def create_bestiary_tab(parent):
     """Creates the Bestiary tab in the GUI."""
     tab_bestiary = ttk.Frame(parent)
     parent.add(tab_bestiary, text="📖 Bestiary")
+    build_bestiary_tab(tab_bestiary)
 
-    mobs_data = load_mobs()
+def build_bestiary_tab(tab_bestiary):
+    """Builds the Bestiary tab's widgets inside an existing frame."""
 
-    # Extract unique Types and Divinities from mobs_data
-    all_divinities = sorted({info.get("Divinity", "").strip() for info in mobs_data.values() if info.get("Divinity")})
-    all_types = sorted({info.get("Type", "").strip() for info in mobs_data.values() if info.get("Type")})
+    # Filled in by the background loader; searches before then see an empty bestiary
+    mobs_data = {}
 
     # Create Main Frame
     main_frame = tk.Frame(tab_bestiary, bg="#000000")
@@ -147,11 +167,13 @@ def create_bestiary_tab(parent):
 
     tk.Label(form, text="Divinity:", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
     div_var = tk.StringVar()
-    ttk.Combobox(form, textvariable=div_var, values=[""] + all_divinities).pack(fill="x", pady=(0, 5))
+    div_combo = ttk.Combobox(form, textvariable=div_var, values=[""])
+    div_combo.pack(fill="x", pady=(0, 5))
 
     tk.Label(form, text="Type:", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
     type_var = tk.StringVar()
-    ttk.Combobox(form, textvariable=type_var, values=[""] + all_types).pack(fill="x", pady=(0, 5))
+    type_combo = ttk.Combobox(form, textvariable=type_var, values=[""])
+    type_combo.pack(fill="x", pady=(0, 5))
 
     # Create a row for "Prefer Exact Match" and "Show Map" inline
     inline_frame = tk.Frame(form, bg="#000000")
@@ -182,3 +204,23 @@ def create_bestiary_tab(parent):
                                                search_results.config(state=tk.NORMAL), search_results.delete("1.0", tk.END),
                                                search_results.config(state=tk.DISABLED), map_button.pack_forget()])
     clear_button.pack(side="left", expand=True, fill="x", padx=5)
+
+    def show_message(message):
+        search_results.config(state=tk.NORMAL)
+        search_results.delete("1.0", tk.END)
+        search_results.insert(tk.END, message)
+        search_results.config(state=tk.DISABLED)
+
+    def on_loaded(dataset):
+        mobs_data.update(dataset["mobs"])
+        # Extract unique Types and Divinities from mobs_data
+        div_combo.config(values=[""] + sorted({info.get("Divinity", "").strip() for info in mobs_data.values() if info.get("Divinity")}))
+        type_combo.config(values=[""] + sorted({info.get("Type", "").strip() for info in mobs_data.values() if info.get("Type")}))
+        show_message("")
+
+    # Fill in once the background loader has the mob data
+    show_message("Loading bestiary data...\n")
+    dataloader.when_loaded(
+        tab_bestiary, "mobs", on_loaded,
+        lambda e: show_message(f"Error loading bestiary data: {e}\nFile expected at:\n{MOBS_JSON_PATH}\n")
+    )
@@ -1,6 +1,17 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
+import io
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import dataloader
+import perf
+import tasks
+
+# Optional: numpy for the vectorized crafting_report, imported on first use (see load_numpy)
+np = None
+numpy_checked = False
 
 # Global variables to store user selections
 selected_files = {
@@ -18,8 +29,68 @@ selected_tiers = {
     "Tier 6": True
 }
 
+# Optimizer mode: plan crafts that can all be made together from shared materials
+optimizer_settings = {
+    "enabled": False,
+    "objective": "count"
+}
+OPTIMIZER_OBJECTIVES = ("count", "tier", "value")
+OPTIMIZER_REPAIR_PASSES = 2
+
+# User-supplied per-craft values for the "value" objective, one "Recipe Name, value" per line
+# in LOCAL_JSON_DIR; recipes without a value count as 1
+RECIPE_VALUES_FILE = "recipe_values.txt"
+recipe_values_cache = {}
+
 # Local folder for text files
-LOCAL_JSON_DIR = "json"
+LOCAL_JSON_DIR = dataloader.DATA_DIR
+
+# Parsed recipe files: file name -> ((mtime_ns, size), tiers, recipes, tier_index)
+parsed_file_cache = {}
+
+# Materials ignored when computing how many of a recipe can be crafted
+EXCLUDED_MATERIALS = ("Violent Essence", "Vigor Essence")
+
+# Last requirement matrix built by build_requirement_matrix (reused while recipes are unchanged)
+requirement_matrix_cache = {}
+
+# Memoized multi-level recipe expansions (reused while the parsed recipes are unchanged).
+# "entry" holds (key, result, recipes) and is replaced in one assignment, so a reader on
+# another thread sees either the old entry or the new one, never a half-updated cache.
+expansion_cache = {}
+
+# Incremental recalculation state for live inventory edits
+live_state = {
+    "lines": {},        # inventory line text -> parsed (item, qty) or None
+    "inventory": {},    # last parsed inventory
+    "key": None,        # identity of the recipes the report was built from
+    "users": {},        # material -> recipes that (directly or via intermediates) use it
+    "report": {}
+}
+LIVE_UPDATE_DELAY_MS = 150
+
+# Mob data and its item -> mobs loot index for the farming planner (loaded on first use)
+farming_index = {}
+
+# Recipe names for the farming planner's dropdown: "entry" is (file selection, sorted names),
+# refreshed by whichever background task last parsed the recipes (never the UI thread)
+recipe_choices = {}
+
+# Batch mode: inventory dumps read from a directory, combined report written next to them
+BATCH_EXTENSIONS = (".txt",)
+BATCH_REPORT_NAME = "batch_report.txt"
+
+# Recipe tables shared with each batch worker process (set once by the pool initializer)
+batch_tables = {}
+
+# Report currently shown in the crafting Treeview, and its (column, descending) sort
+report_view = {
+    "report": {},
+    "sort": ("quantity", True)
+}
+
+# Matches the tier tag in a recipe name; "Tier 1" must not match "Tier 10"
+TIER_TAG_RE = re.compile(r"\bTier\s+(\d+)\b")
 
 # Function to parse tiers and recipes from a local text file
 def parse_local_file(file_path):
@@ -66,111 +137,784 @@ def parse_local_file(file_path):
         print(f"Error reading {file_path}: {e}")
     return tiers, recipes
 
+# Function to find the tier a recipe belongs to (e.g. "Tier 1"), or None if untagged
+def recipe_tier(recipe_name):
+    match = TIER_TAG_RE.search(recipe_name)
+    return f"Tier {int(match.group(1))}" if match else None
+
+# Function to index recipe names by tier
+def build_tier_index(recipes):
+    tier_index = {}
+    for recipe_name in recipes:
+        tier = recipe_tier(recipe_name)
+        if tier is not None:
+            tier_index.setdefault(tier, set()).add(recipe_name)
+    return tier_index
+
+# Function to get a file's parsed tiers, recipes and tier index, re-parsing only when it changes on disk
+def load_parsed_file(file_path):
+    full_path = os.path.join(LOCAL_JSON_DIR, file_path)
+    try:
+        stat = os.stat(full_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    cached = parsed_file_cache.get(file_path)
+    if signature is not None and cached is not None and cached[0] == signature:
+        return cached[1], cached[2], cached[3]
+    tiers, recipes = parse_local_file(file_path)
+    tier_index = build_tier_index(recipes)
+    if signature is not None:
+        parsed_file_cache[file_path] = (signature, tiers, recipes, tier_index)
+    else:
+        parsed_file_cache.pop(file_path, None)
+    return tiers, recipes, tier_index
+
 # Function to parse selected files and tiers
 def parse_files(selected_files):
     tiers = {}
     recipes = {}
+    tier_index = {}
     for file, include in selected_files.items():
         if include:
-            file_tiers, file_recipes = parse_local_file(file)
+            file_tiers, file_recipes, file_tier_index = load_parsed_file(file)
             tiers.update(file_tiers)
             recipes.update(file_recipes)
-    return tiers, recipes
+            for tier, names in file_tier_index.items():
+                tier_index.setdefault(tier, set()).update(names)
+    return tiers, recipes, tier_index
 
 # Function to filter recipes based on selected tiers
-def filter_by_tiers(recipes, selected_tiers):
-    filtered_recipes = {}
-    for recipe_name, materials in recipes.items():
-        for tier in selected_tiers:
-            if selected_tiers[tier] and tier in recipe_name:
-                filtered_recipes[recipe_name] = materials
-    return filtered_recipes
+def filter_by_tiers(recipes, selected_tiers, tier_index=None):
+    if tier_index is None:
+        tier_index = build_tier_index(recipes)
+    wanted = set()
+    for tier, include in selected_tiers.items():
+        if include:
+            wanted |= tier_index.get(tier, set())
+    return {recipe_name: recipes[recipe_name] for recipe_name in recipes if recipe_name in wanted}
+
+# Function to import numpy on first use (it's optional and slow to import at startup)
+def load_numpy():
+    global np, numpy_checked
+    if not numpy_checked:
+        numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+# Function to build the sparse recipe-by-material requirement matrix used by crafting_report
+def build_requirement_matrix(recipes, excluded=EXCLUDED_MATERIALS):
+    """
+    Flatten recipes into parallel arrays, one entry per (recipe, counted material).
+
+    Entries are grouped by recipe row so np.minimum.reduceat can take each recipe's
+    minimum in one pass. The result is cached until the recipes change.
+    """
+    if requirement_matrix_cache.get("recipes") is recipes and requirement_matrix_cache.get("excluded") == tuple(excluded):
+        return requirement_matrix_cache["matrix"]
+    key = (tuple(excluded), tuple((name, id(materials)) for name, materials in recipes.items()))
+    if requirement_matrix_cache.get("key") == key:
+        requirement_matrix_cache["recipes"] = recipes
+        return requirement_matrix_cache["matrix"]
+
+    excluded = set(excluded)
+    names = list(recipes)
+    material_index = {}
+    columns = []
+    quantities = []
+    starts = []
+    for materials in recipes.values():
+        starts.append(len(columns))
+        for item, required_amount in materials.items():
+            if item in excluded:
+                continue
+            columns.append(material_index.setdefault(item, len(material_index)))
+            quantities.append(required_amount)
+    row_sizes = [end - start for start, end in zip(starts, starts[1:] + [len(columns)])]
+    matrix = {
+        "names": names,
+        "material_index": material_index,
+        "columns": np.array(columns, dtype=np.int64),
+        "quantities": np.array(quantities, dtype=np.int64),
+        "starts": np.array([s for s, n in zip(starts, row_sizes) if n], dtype=np.int64),
+        "counted_rows": np.array([i for i, n in enumerate(row_sizes) if n], dtype=np.int64),
+        "empty_rows": [i for i, n in enumerate(row_sizes) if not n],
+    }
+    requirement_matrix_cache.clear()
+    requirement_matrix_cache.update(key=key, matrix=matrix, recipes=recipes, excluded=key[0])
+    return matrix
+
+# Function to compute the max craftable count of every recipe in one vectorized pass
+def craftable_counts(matrix, inventory):
+    inventory_vector = np.zeros(len(matrix["material_index"]), dtype=np.int64)
+    for item, column in matrix["material_index"].items():
+        inventory_vector[column] = inventory.get(item, 0)
+    counts = {}
+    if len(matrix["columns"]):
+        per_material = inventory_vector[matrix["columns"]] // matrix["quantities"]
+        per_recipe = np.minimum.reduceat(per_material, matrix["starts"])
+        names = matrix["names"]
+        for row, count in zip(matrix["counted_rows"].tolist(), per_recipe.tolist()):
+            counts[names[row]] = count
+    for row in matrix["empty_rows"]:
+        # Only excluded materials: nothing limits the count
+        counts[matrix["names"][row]] = float("inf")
+    return counts
 
 # Function to generate crafting report
-def crafting_report(tiers, recipes, inventory):
+def crafting_report(tiers, recipes, inventory, excluded=EXCLUDED_MATERIALS):
     craftable_items = {}
+    if load_numpy() is not None:
+        counts = craftable_counts(build_requirement_matrix(recipes, excluded), inventory)
+        for recipe_name, materials in recipes.items():
+            if counts[recipe_name] > 0:
+                craftable_items[recipe_name] = {
+                    "quantity": counts[recipe_name],
+                    "recipe": materials  # Full recipe, including excluded materials
+                }
+        return craftable_items
+
     for recipe_name, materials in recipes.items():
         max_count = float("inf")
         for item, required_amount in materials.items():
-            # Skip "Violent Essence" and "Vigor Essence" in calculations
-            if item in ["Violent Essence", "Vigor Essence"]:
+            # Skip excluded materials ("Violent Essence" and "Vigor Essence") in calculations
+            if item in excluded:
                 continue
             available_amount = inventory.get(item, 0)
             max_count = min(max_count, available_amount // required_amount)
         if max_count > 0:
             craftable_items[recipe_name] = {
                 "quantity": max_count,
-                "recipe": materials  # Full recipe, including "Violent Essence" and "Vigor Essence"
+                "recipe": materials  # Full recipe, including excluded materials
             }
     return craftable_items
 
-# Function to parse inventory
-def parse_inventory(raw_inventory):
-    inventory = {}
-    for line in raw_inventory.strip().split('\n'):
-        parts = line.split(']')
-        if len(parts) > 1:
-            item_data = parts[1].strip()
+# Function to expand every recipe into base materials, memoized across runs
+def build_recipe_expansions(all_recipes):
+    """
+    Treat recipes as a DAG (an ingredient with its own recipe is an intermediate) and expand
+    each recipe into base materials per craft, visiting intermediates in topological order.
+
+    Returns:
+        dict: "expansions" maps recipe name -> {base material: qty per craft}; "order" is the
+        topological order; "cycles" lists recipes on a cycle (their ingredients are treated
+        as base materials).
+    """
+    key = tuple((name, id(materials)) for name, materials in all_recipes.items())
+    cached = expansion_cache.get("entry")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    # Depth-first topological sort with cycle detection
+    order = []
+    state = {}
+    cycles = set()
+    for root in all_recipes:
+        if root in state:
+            continue
+        stack = [(root, iter(all_recipes[root]))]
+        state[root] = "visiting"
+        while stack:
+            name, children = stack[-1]
+            for child in children:
+                if child not in all_recipes:
+                    continue
+                if state.get(child) == "visiting":
+                    cycles.update(n for n, _ in stack[[n for n, _ in stack].index(child):])
+                elif child not in state:
+                    state[child] = "visiting"
+                    stack.append((child, iter(all_recipes[child])))
+                    break
+            else:
+                stack.pop()
+                state[name] = "done"
+                order.append(name)
+
+    expansions = {}
+    for name in order:
+        expanded = {}
+        for item, qty in all_recipes[name].items():
+            if item in all_recipes and item not in cycles and name not in cycles:
+                for base, base_qty in expansions[item].items():
+                    expanded[base] = expanded.get(base, 0) + qty * base_qty
+            else:
+                expanded[item] = expanded.get(item, 0) + qty
+        expansions[name] = expanded
+
+    result = {"expansions": expansions, "order": order, "cycles": sorted(cycles)}
+    expansion_cache["entry"] = (key, result, all_recipes)  # Keeps all_recipes alive so its ids stay unique
+    return result
+
+# Function to find the base materials (and intermediate crafts) needed for count crafts of a recipe
+def multilevel_requirements(materials, count, all_recipes, expansions, inventory, excluded=EXCLUDED_MATERIALS):
+    """Intermediates in the inventory are used first; the rest are crafted from base materials."""
+    needs = {}
+    intermediates = {}
+    for item, qty in materials.items():
+        need = qty * count
+        if item in expansions and item in all_recipes:
+            crafted = max(0, need - inventory.get(item, 0))
+            needs[item] = needs.get(item, 0) + need - crafted
+            if crafted:
+                intermediates[item] = crafted
+                for base, base_qty in expansions[item].items():
+                    needs[base] = needs.get(base, 0) + base_qty * crafted
         else:
-            item_data = line.strip()
-        if '(' in item_data and ')' in item_data:
-            item_name, quantity = item_data.split('(')
-            item_name = item_name.strip()
-            quantity = int(quantity.replace(')', '').strip())
-            inventory[item_name] = quantity
+            needs[item] = needs.get(item, 0) + need
+    return {item: qty for item, qty in needs.items() if item not in excluded and qty}, intermediates
+
+# Function to find how many of a recipe can be made when intermediates may be crafted first
+def multilevel_count(materials, all_recipes, expansions, inventory, excluded=EXCLUDED_MATERIALS):
+    """Largest feasible count, or float("inf") when more crafts need no more counted materials."""
+    def requirements(count):
+        return multilevel_requirements(materials, count, all_recipes, expansions, inventory, excluded)[0]
+
+    def feasible(count):
+        return all(inventory.get(item, 0) >= qty for item, qty in requirements(count).items())
+
+    if not feasible(1):
+        return 0
+    low, high = 1, 2
+    while feasible(high):
+        # Needs only stop growing once everything still counted is covered by stock or excluded
+        if requirements(high) == requirements(low):
+            return float("inf")
+        low, high = high, high * 2
+    while high - low > 1:
+        mid = (low + high) // 2
+        if feasible(mid):
+            low = mid
+        else:
+            high = mid
+    return low
+
+# Function to generate a crafting report that also counts crafts made through intermediate recipes
+def multilevel_crafting_report(tiers, recipes, all_recipes, inventory, excluded=EXCLUDED_MATERIALS):
+    report = crafting_report(tiers, recipes, inventory, excluded)
+    expansions = build_recipe_expansions(all_recipes)["expansions"]
+    for recipe_name, materials in recipes.items():
+        if not any(item in all_recipes for item in materials):
+            continue
+        if report.get(recipe_name, {}).get("quantity") == float("inf"):
+            continue
+        count = multilevel_count(materials, all_recipes, expansions, inventory, excluded)
+        if count == float("inf"):
+            report[recipe_name] = {"quantity": count, "recipe": materials}
+        elif count > report.get(recipe_name, {}).get("quantity", 0):
+            _, intermediates = multilevel_requirements(materials, count, all_recipes, expansions, inventory, excluded)
+            report[recipe_name] = {"quantity": count, "recipe": materials, "intermediates": intermediates}
+    return report
+
+# Function to read the user's recipe values, re-reading only when the file changes on disk
+def load_recipe_values(file_path=RECIPE_VALUES_FILE):
+    full_path = os.path.join(LOCAL_JSON_DIR, file_path)
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return {}
+    signature = (full_path, stat.st_mtime_ns, stat.st_size)
+    cached = recipe_values_cache.get("entry")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    values = {}
+    try:
+        with open(full_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                recipe_name, _, value = line.rpartition(",")
+                try:
+                    values[recipe_name.strip()] = float(value)
+                except ValueError:
+                    print(f"Error reading {file_path} line {line_number}: bad value '{value.strip()}'")
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+    recipe_values_cache["entry"] = (signature, values)
+    return values
+
+# Function to get the objective weight of one craft of a recipe
+def recipe_weight(recipe_name, objective="count", weights=None):
+    if weights and recipe_name in weights:
+        return weights[recipe_name]
+    if objective == "tier":
+        tier = recipe_tier(recipe_name)
+        return int(tier.split()[1]) if tier else 1
+    return 1
+
+# Function to greedily craft as many of each recipe as the remaining materials allow, in order
+def fill_crafts(order, requirements, remaining, plan):
+    gained = 0
+    for recipe_name, weight in order:
+        needs = requirements[recipe_name]
+        count = min(remaining.get(item, 0) // qty for item, qty in needs.items())
+        if count > 0:
+            for item, qty in needs.items():
+                remaining[item] -= qty * count
+            plan[recipe_name] = plan.get(recipe_name, 0) + count
+            gained += weight * count
+    return gained
+
+# Function to choose a combined craft plan that respects shared materials
+def optimize_crafts(recipes, inventory, objective="count", weights=None, excluded=EXCLUDED_MATERIALS):
+    """
+    Greedy-with-repair plan maximizing the total objective weight of all crafts.
+
+    Recipes are ranked by weight per unit of scarcity-normalized material cost and filled
+    greedily. Repair passes then give back one craft at a time and accept the swap when
+    refilling the freed materials gains more weight than was given up. Recipes that only use
+    excluded (or qty 0) materials are unbounded and left out of the plan.
+
+    Returns:
+        dict: Same shape as crafting_report, with "quantity" being the planned count.
+    """
+    excluded = set(excluded)
+    requirements = {}
+    for recipe_name, materials in recipes.items():
+        # A material listed with qty 0 costs nothing, so it never bounds the recipe
+        needs = {item: qty for item, qty in materials.items() if item not in excluded and qty > 0}
+        if needs and all(inventory.get(item, 0) >= qty for item, qty in needs.items()):
+            requirements[recipe_name] = needs
+
+    def efficiency(recipe_name):
+        cost = sum(qty / inventory.get(item, 0) for item, qty in requirements[recipe_name].items())
+        return recipe_weight(recipe_name, objective, weights) / cost
+
+    ranked = sorted(requirements, key=efficiency, reverse=True)
+    order = [(recipe_name, recipe_weight(recipe_name, objective, weights)) for recipe_name in ranked]
+    remaining = {item: inventory.get(item, 0) for needs in requirements.values() for item in needs}
+    plan = {}
+    fill_crafts(order, requirements, remaining, plan)
+
+    # Material -> recipes using it, so a repair only refills recipes that can use what was freed
+    users = {}
+    for recipe_name, weight in order:
+        for item in requirements[recipe_name]:
+            users.setdefault(item, []).append((recipe_name, weight))
+
+    rank = {recipe_name: i for i, recipe_name in enumerate(ranked)}
+    for _ in range(OPTIMIZER_REPAIR_PASSES):
+        improved = False
+        for recipe_name, weight in order:
+            if not plan.get(recipe_name):
+                continue
+            candidates = {}
+            for item in requirements[recipe_name]:
+                for candidate, candidate_weight in users[item]:
+                    if candidate != recipe_name:
+                        candidates[candidate] = candidate_weight
+            candidates = sorted(candidates.items(), key=lambda candidate: rank[candidate[0]])
+            touched = {item for candidate, _ in candidates for item in requirements[candidate]}
+            trial_remaining = {item: remaining[item] for item in touched | set(requirements[recipe_name])}
+            for item, qty in requirements[recipe_name].items():
+                trial_remaining[item] += qty
+            trial_plan = {}
+            if fill_crafts(candidates, requirements, trial_remaining, trial_plan) > weight:
+                remaining.update(trial_remaining)
+                plan[recipe_name] -= 1
+                for candidate, count in trial_plan.items():
+                    plan[candidate] = plan.get(candidate, 0) + count
+                improved = True
+        if not improved:
+            break
+
+    return {
+        recipe_name: {"quantity": plan[recipe_name], "recipe": recipes[recipe_name]}
+        for recipe_name in ranked if plan.get(recipe_name)
+    }
+
+# Function to parse one inventory line into (item, qty), or None if it holds no item
+def parse_inventory_line(line):
+    """Raises ValueError for a line that names an item but has no readable "(qty)"."""
+    item_data = line.split(']', 1)[1] if ']' in line else line
+    if '(' not in item_data:
+        return None
+    # The quantity is the last "(...)" group, so names like "Potion (Greater) (5)" still parse
+    item_name, _, quantity = item_data.rpartition('(')
+    quantity = quantity.strip()
+    if not quantity.endswith(')'):
+        raise ValueError("missing closing ')'")
+    quantity = quantity[:-1].strip()
+    if not quantity.isdigit():
+        raise ValueError(f"bad quantity '{quantity}'")
+    item_name = item_name.strip()
+    if not item_name:
+        raise ValueError("missing item name")
+    return item_name, int(quantity)
+
+# Function to stream (item, qty) pairs from a string, file object or any iterable of lines
+def iter_inventory(source, errors=None, line_cache=None):
+    """
+    Yields (item, qty) one line at a time. Unreadable lines are skipped and, when errors is
+    a list, recorded there as (line number, line, reason).
+    """
+    lines = io.StringIO(source) if isinstance(source, str) else source
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if line_cache is None:
+            try:
+                parsed = parse_inventory_line(line)
+            except ValueError as e:
+                parsed = e
+        elif line in line_cache:
+            parsed = line_cache[line]
+        else:
+            try:
+                parsed = parse_inventory_line(line)
+            except ValueError as e:
+                parsed = e
+            line_cache[line] = parsed
+        if isinstance(parsed, ValueError):
+            if errors is not None:
+                errors.append((line_number, line.strip(), str(parsed)))
+        elif parsed:
+            yield parsed
+
+# Function to parse inventory (duplicate item lines are summed)
+def parse_inventory(raw_inventory, line_cache=None, errors=None):
+    inventory = {}
+    for item_name, quantity in iter_inventory(raw_inventory, errors, line_cache):
+        inventory[item_name] = inventory.get(item_name, 0) + quantity
     return inventory
 
+# Function to describe skipped inventory lines
+def format_inventory_errors(errors, limit=20):
+    lines = [f"Skipped {len(errors)} unreadable inventory line(s):"]
+    for line_number, line, reason in errors[:limit]:
+        lines.append(f"  line {line_number}: {line} ({reason})")
+    if len(errors) > limit:
+        lines.append(f"  ... and {len(errors) - limit} more")
+    return "\n".join(lines) + "\n"
+
+# Function to compute one recipe's report entry (None when it can't be crafted)
+def recipe_report_entry(materials, all_recipes, expansions, inventory, excluded=EXCLUDED_MATERIALS):
+    max_count = float("inf")
+    for item, required_amount in materials.items():
+        if item in excluded:
+            continue
+        max_count = min(max_count, inventory.get(item, 0) // required_amount)
+    entry = {"quantity": max_count, "recipe": materials}
+    if max_count != float("inf") and any(item in all_recipes for item in materials):
+        count = multilevel_count(materials, all_recipes, expansions, inventory, excluded)
+        if count == float("inf"):
+            entry = {"quantity": count, "recipe": materials}
+        elif count > max_count:
+            _, intermediates = multilevel_requirements(materials, count, all_recipes, expansions, inventory, excluded)
+            entry = {"quantity": count, "recipe": materials, "intermediates": intermediates}
+    return entry if entry["quantity"] > 0 else None
+
+# Function to update the crafting report for an edited inventory, recomputing only affected recipes
+def incremental_crafting_report(tiers, recipes, all_recipes, raw_inventory, excluded=EXCLUDED_MATERIALS, errors=None):
+    """
+    Diff the inventory text against the last parse and recompute only the recipes that use
+    a changed material, found through a material -> recipes reverse index. Falls back to a
+    full multilevel_crafting_report when the selected recipes change.
+    """
+    line_cache = live_state["lines"]
+    if len(line_cache) > 4 * (raw_inventory.count("\n") + 1) + 1000:
+        line_cache.clear()
+    inventory = parse_inventory(raw_inventory, line_cache, errors)
+
+    key = (tuple(excluded), tuple((name, id(materials)) for name, materials in recipes.items()),
+           tuple((name, id(materials)) for name, materials in all_recipes.items()))
+    if live_state["key"] != key:
+        expansions = build_recipe_expansions(all_recipes)["expansions"]
+        users = {}
+        for recipe_name, materials in recipes.items():
+            used = set(materials)
+            for item in materials:
+                used.update(expansions.get(item, ()) if item in all_recipes else ())
+            for item in used:
+                users.setdefault(item, set()).add(recipe_name)
+        live_state.update(key=key, users=users, inventory=inventory,
+                          report=multilevel_crafting_report(tiers, recipes, all_recipes, inventory, excluded))
+        return live_state["report"]
+
+    previous = live_state["inventory"]
+    changed = {item for item in previous.keys() | inventory.keys() if previous.get(item) != inventory.get(item)}
+    live_state["inventory"] = inventory
+    if not changed:
+        return live_state["report"]
+
+    expansions = build_recipe_expansions(all_recipes)["expansions"]
+    affected = set()
+    for item in changed:
+        affected |= live_state["users"].get(item, set())
+    report = live_state["report"]
+    membership_changed = False
+    for recipe_name in affected:
+        entry = recipe_report_entry(recipes[recipe_name], all_recipes, expansions, inventory, excluded)
+        if entry is None:
+            membership_changed |= report.pop(recipe_name, None) is not None
+        else:
+            membership_changed |= recipe_name not in report
+            report[recipe_name] = entry
+    if membership_changed:
+        # Keep the report in recipe-file order
+        live_state["report"] = {name: report[name] for name in recipes if name in report}
+    return live_state["report"]
+
+# Function to get the mob data and item -> dropping mobs index, built once
+def get_farming_index():
+    if not farming_index:
+        try:
+            dataset = dataloader.get_future("mobs").result()
+            farming_index.update(mobs=dataset["mobs"], loot=dataset["loot"])
+        except Exception as e:
+            print(f"Error loading mob data: {e}")
+            return {}, {}
+    return farming_index["mobs"], farming_index["loot"]
+
+# Function to compute missing materials for a target craft and where to farm them
+def plan_material_deficit(recipe_name, quantity, all_recipes, inventory, excluded=EXCLUDED_MATERIALS):
+    """
+    Returns:
+        tuple: (deficits, intermediates) where deficits maps each missing base material to
+        {"missing": qty, "sources": [(mob, level, location), ...]} and intermediates maps
+        intermediate recipes to the number that must be crafted first.
+    """
+    expansions = build_recipe_expansions(all_recipes)["expansions"]
+    needs, intermediates = multilevel_requirements(
+        all_recipes[recipe_name], quantity, all_recipes, expansions, inventory, excluded
+    )
+    mobs_data, loot_index = get_farming_index()
+    deficits = {}
+    for item, need in needs.items():
+        missing = need - inventory.get(item, 0)
+        if missing <= 0:
+            continue
+        sources = [
+            (mob.strip(), mobs_data[mob].get("Level", "?"), mobs_data[mob].get("Location", "Unknown"))
+            for mob in loot_index.get(item.lower(), [])
+        ]
+        deficits[item] = {"missing": missing, "sources": sources}
+    return deficits, intermediates
+
+# Function to remember the recipe names parsed for a file selection (any thread)
+def remember_recipe_names(files, recipes):
+    recipe_choices["entry"] = (dict(files), sorted(recipes))
+
+# Function to parse the selected files and return their recipe names (runs on the cpu pool)
+def recipe_names_for(files):
+    recipes = parse_files(files)[1]
+    remember_recipe_names(files, recipes)
+    return recipe_choices["entry"][1]
+
+# Function to build the shopping/farming list text for a target craft (runs on the cpu pool)
+def farming_plan_text(recipe_name, quantity, raw_inventory, files):
+    tiers, recipes, tier_index = parse_files(files)
+    remember_recipe_names(files, recipes)
+    if recipe_name not in recipes or not quantity.strip().isdigit() or int(quantity) < 1:
+        return "Pick a recipe and enter a quantity (e.g., 5).\n"
+    inventory = parse_inventory(raw_inventory, live_state["lines"])
+    deficits, intermediates = plan_material_deficit(recipe_name, int(quantity), recipes, inventory)
+    lines = [f"To craft {quantity} {recipe_name}:"]
+    for item, qty in intermediates.items():
+        lines.append(f"* craft {qty} {item} first")
+    if not deficits:
+        lines.append("Nothing missing.")
+    for item, deficit in deficits.items():
+        lines.append(f"- {item}: need {deficit['missing']} more")
+        if not deficit["sources"]:
+            lines.append("    no known mob drop (buy or craft)")
+        for mob, level, location in deficit["sources"]:
+            lines.append(f"    farm {mob} (Lvl {level}, {location})")
+    return "\n".join(lines) + "\n"
+
+# Function to replace the recipe details text
+def show_details(recipe_text, message):
+    recipe_text.config(state=tk.NORMAL)
+    recipe_text.delete("1.0", tk.END)
+    recipe_text.insert(tk.END, message)
+    recipe_text.config(state=tk.DISABLED)
+
+# Function to show the shopping/farming list for a target craft
+def run_farming_plan(recipe_name, quantity, inventory_text, recipe_text):
+    show_details(recipe_text, "Planning...\n")
+    tasks.run_task(
+        recipe_text, "cpu", farming_plan_text, recipe_name, quantity,
+        inventory_text.get("1.0", tk.END).strip(), dict(selected_files),
+        on_done=lambda message: show_details(recipe_text, message),
+        on_error=lambda e: show_details(recipe_text, f"Planning failed: {e}\n")
+    )
+
+# Function to receive the parsed recipe tables once per batch worker process
+def init_batch_worker(tiers, recipes, all_recipes):
+    batch_tables.update(tiers=tiers, recipes=recipes, all_recipes=all_recipes)
+
+# Function to run the crafting report for one inventory dump (runs in a worker process)
+def batch_report_file(path):
+    try:
+        errors = []
+        with open(path, "r", encoding="utf-8") as f:
+            inventory = parse_inventory(f, errors=errors)
+        report = multilevel_crafting_report(
+            batch_tables["tiers"], batch_tables["recipes"], batch_tables["all_recipes"], inventory
+        )
+        return path, report, errors, None
+    except Exception as e:
+        return path, None, [], str(e)
+
+# Function to run the crafting report for every inventory dump in a directory on a process pool
+def run_batch(directory, files, tier_selection, output_path=None, workers=None):
+    """
+    Evaluates each inventory dump in directory in parallel and writes one combined report,
+    using the given recipe files and tier selection.
+
+    The parsed recipe tables are sent to each worker once (via the pool initializer) rather
+    than with every file.
+
+    Returns:
+        str: Path of the combined report.
+    """
+    tiers, recipes, tier_index = parse_files(files)
+    filtered_recipes = filter_by_tiers(recipes, tier_selection, tier_index)
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(BATCH_EXTENSIONS) and name != BATCH_REPORT_NAME
+    )
+    output_path = output_path or os.path.join(directory, BATCH_REPORT_NAME)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                             initargs=(tiers, filtered_recipes, recipes)) as pool:
+        results = list(pool.map(batch_report_file, paths, chunksize=max(1, len(paths) // 32)))
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        for path, report, line_errors, error in results:
+            f.write(f"=== {os.path.basename(path)} ===\n")
+            if error:
+                f.write(f"Error: {error}\n\n")
+                continue
+            if line_errors:
+                f.write(format_inventory_errors(line_errors))
+            if not report:
+                f.write("No craftable items found.\n")
+            for recipe_name, details in report.items():
+                f.write(f"{recipe_name}: Can craft {details['quantity']}")
+                if details.get("intermediates"):
+                    via = ", ".join(f"{qty} {item}" for item, qty in details["intermediates"].items())
+                    f.write(f" (via {via})")
+                f.write("\n")
+            f.write("\n")
+    return output_path
+
+# Function to pick a directory and run the batch report without blocking the GUI
+def start_batch(recipe_text):
+    directory = filedialog.askdirectory(title="Select inventory dumps folder")
+    if not directory:
+        return
+    show_details(recipe_text, f"Running batch for {directory}...\n")
+    # The batch mostly waits on its process pool, so it runs on the io pool; the selections
+    # are copied here so the worker never reads the live globals
+    tasks.run_task(
+        recipe_text, "io", run_batch, directory, dict(selected_files), dict(selected_tiers),
+        on_done=lambda path: show_details(recipe_text, f"Batch report written to:\n{path}\n"),
+        on_error=lambda e: show_details(recipe_text, f"Batch failed: {e}\n")
+    )
+
+# Function to compute the crafting report (or optimizer plan) for the given inventory text (runs on the cpu pool)
+@perf.timed("crafting.calc")
+def compute_crafting(raw_inventory, files, tier_selection, optimizer, token=None):
+    """
+    Returns:
+        tuple: (report, label, errors), or None when a newer calculation superseded this one.
+    """
+    tiers, recipes, tier_index = parse_files(files)
+    remember_recipe_names(files, recipes)
+    filtered_recipes = filter_by_tiers(recipes, tier_selection, tier_index)
+    if token is not None and token.cancelled:
+        return None
+
+    # Generate crafting report (or a combined plan when the optimizer is enabled)
+    errors = []
+    if optimizer["enabled"]:
+        inventory = parse_inventory(raw_inventory, live_state["lines"], errors)
+        weights = load_recipe_values() if optimizer["objective"] == "value" else None
+        report = optimize_crafts(filtered_recipes, inventory, optimizer["objective"], weights)
+        label = "Plan"
+    else:
+        # Copy: the incremental report is updated in place by later calculations
+        report = dict(incremental_crafting_report(tiers, filtered_recipes, recipes, raw_inventory, errors=errors))
+        label = "Can Craft"
+    return report, label, errors
+
 # Function to run the crafting calculation and update the GUI
-def run_crafting(inventory_text, output_text, recipe_text):
+def run_crafting(inventory_text, output_tree, recipe_text):
     """
-    Runs the crafting calculation and updates the GUI with the crafting report and recipe details.
+    Runs the crafting calculation in the background and updates the GUI with the crafting report.
 
     Args:
         inventory_text (tk.Text): Text widget for the inventory input.
-        output_text (tk.Text): Text widget for the crafting report output.
+        output_tree (ttk.Treeview): Treeview for the crafting report output.
         recipe_text (tk.Text): Text widget for the recipe details output.
     """
-    # Parse inventory from user input
-    raw_inventory = inventory_text.get("1.0", tk.END).strip()
-    inventory = parse_inventory(raw_inventory)
+    def show(result):
+        if result is None:
+            return
+        report, label, errors = result
+        report_view["report"] = report
+        output_tree.heading("quantity", text=label)
+        render_report(output_tree)
 
-    # Parse selected files and tiers
-    tiers, recipes = parse_files(selected_files)
-    filtered_recipes = filter_by_tiers(recipes, selected_tiers)
+        # Clear the recipe details (the selection drives them from here) and list any skipped lines
+        show_details(recipe_text, format_inventory_errors(errors) if errors else "")
 
-    # Generate crafting report
-    report = crafting_report(tiers, filtered_recipes, inventory)
+    # Snapshot the inputs on the UI thread; a newer run supersedes one still queued
+    tasks.run_task(
+        output_tree, "cpu", compute_crafting, inventory_text.get("1.0", tk.END).strip(),
+        dict(selected_files), dict(selected_tiers), dict(optimizer_settings),
+        on_done=show, on_error=lambda e: show_details(recipe_text, f"Crafting calculation failed: {e}\n"),
+        key="crafting"
+    )
 
-    # Clear the output text widgets
-    output_text.config(state=tk.NORMAL)
-    output_text.delete("1.0", tk.END)
-    recipe_text.config(state=tk.NORMAL)
-    recipe_text.delete("1.0", tk.END)
+# Function to sort key for a report row
+def report_sort_key(column, recipe_name, details):
+    if column == "quantity":
+        return details["quantity"]
+    if column == "tier":
+        tier = recipe_tier(recipe_name)
+        return int(tier.split()[1]) if tier else 0
+    return recipe_name.lower()
 
-    if report:
-        for recipe_name, details in report.items():
-            # Display the craftable item name and quantity
-            output_text.insert(tk.END, f"{recipe_name}: Can craft {details['quantity']} ")
-
-            # Add a "Show Recipe" button next to each item
-            def show_recipe(r_name=recipe_name, r_details=details['recipe']):
-                recipe_text.config(state=tk.NORMAL)
-                recipe_text.delete("1.0", tk.END)
-                recipe_text.insert(tk.END, f"Recipe for {r_name}:\n")
-                for material, qty in r_details.items():
-                    # Always show "Violent Essence" and "Vigor Essence" in the recipe
-                    recipe_text.insert(tk.END, f"- {material}: {qty}\n")
-                recipe_text.config(state=tk.DISABLED)
-
-            # Create a button and place it to the right of the text
-            button = tk.Button(output_text, text="Show Recipe", command=show_recipe, bg="#00FF00", fg="#000000")
-            output_text.window_create("end", window=button)
-            output_text.insert("end", "\n")
-    else:
-        output_text.insert(tk.END, "No craftable items found.\n")
+# Function to (re)fill the report Treeview in the current sort order
+@perf.timed("render.crafting")
+def render_report(output_tree):
+    output_tree.delete(*output_tree.get_children())
+    report = report_view["report"]
+    if not report:
+        output_tree.insert("", "end", values=("No craftable items found.", "", "", ""))
+        return
+    column, descending = report_view["sort"]
+    rows = sorted(report.items(), key=lambda row: report_sort_key(column, *row), reverse=descending)
+    for recipe_name, details in rows:
+        via = ", ".join(f"{qty} {item}" for item, qty in details.get("intermediates", {}).items())
+        output_tree.insert("", "end", iid=recipe_name,
+                           values=(recipe_name, details["quantity"], recipe_tier(recipe_name) or "", via))
 
-    # Disable editing for text widgets
-    output_text.config(state=tk.DISABLED)
+# Function to sort the report by a column, toggling direction on repeat clicks
+def sort_report(output_tree, column):
+    current, descending = report_view["sort"]
+    report_view["sort"] = (column, not descending if current == column else column != "item")
+    render_report(output_tree)
+
+# Function to show the selected recipe in the details pane
+def show_selected_recipe(output_tree, recipe_text):
+    selection = output_tree.selection()
+    details = report_view["report"].get(selection[0]) if selection else None
+    if details is None:
+        return
+    recipe_text.config(state=tk.NORMAL)
+    recipe_text.delete("1.0", tk.END)
+    recipe_text.insert(tk.END, f"Recipe for {selection[0]}:\n")
+    for material, qty in details["recipe"].items():
+        # Always show "Violent Essence" and "Vigor Essence" in the recipe
+        recipe_text.insert(tk.END, f"- {material}: {qty}\n")
+    for item, qty in details.get("intermediates", {}).items():
+        recipe_text.insert(tk.END, f"* craft {qty} {item} first\n")
     recipe_text.config(state=tk.DISABLED)
 
 # Function to toggle file selection
@@ -191,6 +935,15 @@ def create_crafting_tab(parent):
     """
     tab_crafting = ttk.Frame(parent, style="Dark.TFrame")
     parent.add(tab_crafting, text="🛠️ Crafting")
+    build_crafting_tab(tab_crafting)
+
+def build_crafting_tab(tab_crafting):
+    """
+    Builds the Crafting tab's widgets inside an existing frame.
+
+    Args:
+        tab_crafting (ttk.Frame): Frame to build the tab in.
+    """
 
     # Apply black and green theme with Lucida Console font
     style = ttk.Style()
@@ -223,9 +976,49 @@ def create_crafting_tab(parent):
 
     # Run Button
     run_button = ttk.Button(top_frame, text="Run Crafting Calculation", style="Dark.TButton",
-                            command=lambda: run_crafting(inventory_text, output_text, recipe_text))
+                            command=lambda: run_crafting(inventory_text, output_tree, recipe_text))
     run_button.grid(row=0, column=2, padx=10, pady=10, sticky="nsew")
 
+    # Batch Button: run the report for a folder of inventory dumps
+    batch_button = ttk.Button(top_frame, text="Batch Folder...", style="Dark.TButton",
+                              command=lambda: start_batch(recipe_text))
+    batch_button.grid(row=1, column=2, padx=10, pady=(0, 10), sticky="nsew")
+
+    # Optimizer Options
+    optimizer_frame = ttk.LabelFrame(top_frame, text="Optimizer", style="Dark.TLabel")
+    optimizer_frame.grid(row=0, column=3, padx=5, sticky="nsew")
+    optimizer_var = tk.BooleanVar(value=optimizer_settings["enabled"])
+    ttk.Checkbutton(optimizer_frame, text="Share materials", variable=optimizer_var, style="Dark.TCheckbutton",
+                    command=lambda: optimizer_settings.update(enabled=optimizer_var.get())).pack(anchor="w")
+    objective_var = tk.StringVar(value=optimizer_settings["objective"])
+    objective_box = ttk.Combobox(optimizer_frame, textvariable=objective_var, values=OPTIMIZER_OBJECTIVES,
+                                 state="readonly", width=8)
+    objective_box.bind("<<ComboboxSelected>>", lambda e: optimizer_settings.update(objective=objective_var.get()))
+    objective_box.pack(anchor="w", pady=(5, 0))
+
+    # Farming Planner: missing materials for a target craft and the mobs that drop them
+    farming_frame = ttk.LabelFrame(top_frame, text="Farming Planner", style="Dark.TLabel")
+    farming_frame.grid(row=0, column=4, padx=5, sticky="nsew")
+    target_var = tk.StringVar()
+
+    # Show the names already parsed in the background; re-parse there if the file selection changed
+    def refresh_targets():
+        entry = recipe_choices.get("entry")
+        if entry is not None:
+            target_box.config(values=entry[1])
+        if entry is None or entry[0] != selected_files:
+            tasks.run_task(target_box, "cpu", recipe_names_for, dict(selected_files),
+                           on_done=lambda names: target_box.config(values=names))
+
+    target_box = ttk.Combobox(farming_frame, textvariable=target_var, width=24, postcommand=refresh_targets)
+    target_box.pack(anchor="w")
+    target_qty = tk.Entry(farming_frame, width=6, bg="#000000", fg="#00FF00", font=("Lucida Console", 10),
+                          insertbackground="#00FF00")
+    target_qty.insert(0, "1")
+    target_qty.pack(anchor="w", pady=(5, 0))
+    ttk.Button(farming_frame, text="Plan", style="Dark.TButton",
+               command=lambda: run_farming_plan(target_var.get(), target_qty.get(), inventory_text, recipe_text)).pack(anchor="w", pady=(5, 0))
+
     # Inventory Input
     inventory_frame = ttk.LabelFrame(tab_crafting, text="Enter Inventory", style="Dark.TLabel")
     inventory_frame.pack(padx=10, pady=10, fill="x")
@@ -233,13 +1026,40 @@ def create_crafting_tab(parent):
                              insertbackground="#00FF00")
     inventory_text.pack(fill="x")
 
+    # Live updates: recalculate shortly after the inventory text stops changing
+    pending_update = {"id": None}
+
+    def run_live_update():
+        pending_update["id"] = None
+        run_crafting(inventory_text, output_tree, recipe_text)
+
+    def on_inventory_modified(event=None):
+        if not inventory_text.edit_modified():
+            return
+        inventory_text.edit_modified(False)
+        if pending_update["id"] is not None:
+            inventory_text.after_cancel(pending_update["id"])
+        pending_update["id"] = inventory_text.after(LIVE_UPDATE_DELAY_MS, run_live_update)
+
+    inventory_text.bind("<<Modified>>", on_inventory_modified)
+
     # Crafting Report Output
     output_frame = ttk.LabelFrame(tab_crafting, text="Crafting Report", style="Dark.TLabel")
     output_frame.pack(padx=10, pady=10, fill="x")
-    output_text = tk.Text(output_frame, height=10, bg="#000000", fg="#00FF00", font=("Lucida Console", 10),
-                          insertbackground="#00FF00")
-    output_text.pack(fill="x")
-    output_text.config(state=tk.DISABLED)
+    style.configure("Dark.Treeview", background="#000000", fieldbackground="#000000", foreground="#00FF00",
+                    font=("Lucida Console", 10))
+    style.configure("Dark.Treeview.Heading", background="#000000", foreground="#00FF00", font=("Lucida Console", 10))
+    output_tree = ttk.Treeview(output_frame, columns=("item", "quantity", "tier", "via"), show="headings",
+                               height=10, selectmode="browse", style="Dark.Treeview")
+    for column, heading, width in (("item", "Item", 300), ("quantity", "Can Craft", 90), ("tier", "Tier", 70),
+                                   ("via", "Via", 200)):
+        output_tree.heading(column, text=heading, command=lambda c=column: sort_report(output_tree, c))
+        output_tree.column(column, width=width, anchor="w", stretch=column in ("item", "via"))
+    output_scroll = ttk.Scrollbar(output_frame, orient="vertical", command=output_tree.yview)
+    output_tree.configure(yscrollcommand=output_scroll.set)
+    output_scroll.pack(side="right", fill="y")
+    output_tree.pack(fill="x")
+    output_tree.bind("<<TreeviewSelect>>", lambda e: show_selected_recipe(output_tree, recipe_text))
 
     # Recipe Details Output
     recipe_frame = ttk.LabelFrame(tab_crafting, text="Recipe Details", style="Dark.TLabel")
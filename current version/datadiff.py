@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import sys
+
+from datasync import SyncError, apply_patch, content_hash
+
+# --- Mob Dataset Diff / Merge ---
+# Compares and merges mob files (e.g. ../mobs.json, ../mobs3.json and json/mobs.json), and
+# writes the compact patch files datasync applies instead of downloading a whole file.
+#
+#   python datadiff.py diff OLD NEW
+#   python datadiff.py merge A B [C ...] -o merged.json --rule Map=first --rule "Loot Drops=union"
+#   python datadiff.py patch OLD NEW -o patches/mobs-1.json [--manifest DIR/manifest.json]
+#   python datadiff.py apply PATCH FILE
+#
+# To publish: write the patch against the file clients have now, copy the new file over it,
+# then rerun "datasync.py --manifest DIR" (registered patches are kept).
+#
+# Records are keyed by normalized name (trimmed, case-folded, inner whitespace collapsed) and
+# fields are compared after normalization ("Ice " == "Ice", " ?" == "?" == unknown), so only
+# real disagreements show up. Every step is a dict lookup per record: linear in the data size.
+HEADER_NAME = "Name"
+UNKNOWN_VALUES = ("", "?", "??", "???")
+UNKNOWN_MARKER = "?"  # Written for unknown text fields in merged output
+LIST_FIELDS = ("Loot Drops",)
+
+# Conflict rules, per field (--rule FIELD=RULE) or for every field (--rule default=RULE):
+#   known    - the first source (in the order given) with a known value wins
+#   first    - the first source that has the record wins, even if its value is unknown
+#   union    - lists are combined in order without duplicates (text fields fall back to "known")
+#   conflict - disagreeing known values leave the field unknown so it can be fixed by hand
+MERGE_RULES = ("known", "first", "union", "conflict")
+DEFAULT_RULE = "known"
+
+
+# --- Normalization ---
+def normalize_key(name):
+    return " ".join(name.split()).casefold()
+
+def normalize_value(field, value):
+    """Comparable form of a field value; None means unknown."""
+    if field in LIST_FIELDS or isinstance(value, list):
+        if value is None:
+            return None
+        items = value if isinstance(value, list) else [value]
+        items = tuple(" ".join(str(item).split()) for item in items if str(item).strip())
+        return items or None
+    if value is None:
+        return None
+    value = " ".join(str(value).split())
+    return None if value in UNKNOWN_VALUES else value
+
+def load_dataset(path):
+    """
+    Load a mob file into keyed, normalized form.
+
+    Returns:
+        dict: normalized key -> {"name": display name, "fields": {field: normalized value}},
+        in file order, without the header row.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected an object keyed by mob name")
+    records = {}
+    for name, info in data.items():
+        if not isinstance(info, dict) or info.get("Level") == "Lvl":
+            continue
+        key = normalize_key(name)
+        if key in records:
+            print(f"{path}: duplicate entry for {name.strip()!r}; keeping the first")
+            continue
+        records[key] = {"name": " ".join(name.split()),
+                        "fields": {field: normalize_value(field, value) for field, value in info.items()}}
+    return records
+
+# --- Diff ---
+def diff_datasets(old, new):
+    """
+    Record- and field-level differences between two normalized datasets.
+
+    Returns:
+        dict: "added"/"removed" list keys; "changed" maps key -> {field: (old, new)};
+        "unchanged" counts identical records.
+    """
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    changed = {}
+    unchanged = 0
+    for key, record in new.items():
+        previous = old.get(key)
+        if previous is None:
+            continue
+        fields = {}
+        for field in record["fields"].keys() | previous["fields"].keys():
+            before, after = previous["fields"].get(field), record["fields"].get(field)
+            if before != after:
+                fields[field] = (before, after)
+        if fields:
+            changed[key] = fields
+        else:
+            unchanged += 1
+    return {"added": added, "removed": removed, "changed": changed, "unchanged": unchanged}
+
+def format_value(value):
+    if value is None:
+        return "(unknown)"
+    return ", ".join(value) if isinstance(value, tuple) else value
+
+def format_diff(diff, old, new):
+    lines = [f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+             f"{len(diff['changed'])} changed, {diff['unchanged']} unchanged"]
+    for key in diff["added"]:
+        lines.append(f"+ {new[key]['name']}")
+    for key in diff["removed"]:
+        lines.append(f"- {old[key]['name']}")
+    for key, fields in diff["changed"].items():
+        lines.append(f"~ {new[key]['name']}")
+        for field in sorted(fields):
+            before, after = fields[field]
+            lines.append(f"    {field}: {format_value(before)} -> {format_value(after)}")
+    return "\n".join(lines)
+
+# --- Merge ---
+def parse_rules(rule_args):
+    """Turn ["Map=first", "default=union"] into {"Map": "first", "default": "union"}."""
+    rules = {"default": DEFAULT_RULE}
+    for rule_arg in rule_args or []:
+        field, _, rule = rule_arg.partition("=")
+        if rule not in MERGE_RULES:
+            raise ValueError(f"unknown rule {rule!r} for {field!r} (choose from {', '.join(MERGE_RULES)})")
+        rules[field.strip()] = rule
+    return rules
+
+def merge_field(field, values, rule):
+    """
+    Resolve one field from the sources' values (highest priority first; None = unknown).
+
+    Returns:
+        tuple: (value, conflict) where conflict is True when known values disagreed.
+    """
+    known = [value for value in values if value is not None]
+    conflict = len(set(known)) > 1
+    if rule == "first":
+        return values[0], conflict
+    if rule == "union" and known and isinstance(known[0], tuple):
+        merged = {}
+        for items in known:
+            for item in items:
+                merged.setdefault(item.casefold(), item)
+        return tuple(merged.values()), False  # Combining the lists resolves the disagreement
+    if rule == "conflict" and conflict:
+        return None, conflict
+    return (known[0] if known else None), conflict
+
+def merge_datasets(datasets, rules, common_only=False):
+    """
+    Merge normalized datasets (highest priority first) into one.
+
+    Returns:
+        tuple: (merged records in first-seen order, conflicts as {key: [field]})
+    """
+    order = {}
+    for dataset in datasets:
+        for key in dataset:
+            order.setdefault(key, None)
+    merged = {}
+    conflicts = {}
+    for key in order:
+        sources = [dataset[key] for dataset in datasets if key in dataset]
+        if common_only and len(sources) < len(datasets):
+            continue
+        field_names = {}
+        for source in sources:
+            for field in source["fields"]:
+                field_names.setdefault(field, None)
+        fields = {}
+        for field in field_names:
+            value, conflict = merge_field(field, [source["fields"].get(field) for source in sources],
+                                          rules.get(field, rules["default"]))
+            fields[field] = value
+            if conflict:
+                conflicts.setdefault(key, []).append(field)
+        merged[key] = {"name": sources[0]["name"], "fields": fields}
+    return merged, conflicts
+
+def to_mob_file(records, header=None):
+    """Back to the app's mobs.json layout (header row first, lists for list fields)."""
+    data = {}
+    if header is not None:
+        data[HEADER_NAME] = header
+    for record in records.values():
+        info = {}
+        for field, value in record["fields"].items():
+            if field in LIST_FIELDS or isinstance(value, tuple):
+                info[field] = list(value) if value else None
+            else:
+                info[field] = UNKNOWN_MARKER if value is None else value
+        data[record["name"]] = info
+    return data
+
+def read_header(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    header = data.get(HEADER_NAME)
+    return header if isinstance(header, dict) and header.get("Level") == "Lvl" else None
+
+# --- Patches ---
+def build_patch(old_data, new_data, file_name="mobs.json"):
+    """
+    Smallest patch (datasync format) turning old_data into new_data: whole records for
+    additions, changed fields only for edits. Works on the raw JSON so the result hashes
+    exactly like new_data.
+    """
+    patch = {"file": file_name, "from": content_hash(file_name, json.dumps(old_data).encode("utf-8")),
+             "to": content_hash(file_name, json.dumps(new_data).encode("utf-8")),
+             "set": {}, "delete": [], "update": {}, "unset": {}}
+    for key, value in new_data.items():
+        if key not in old_data:
+            patch["set"][key] = value
+            continue
+        previous = old_data[key]
+        if previous == value:
+            continue
+        if not (isinstance(previous, dict) and isinstance(value, dict)):
+            patch["set"][key] = value
+            continue
+        updated = {field: field_value for field, field_value in value.items()
+                   if field not in previous or previous[field] != field_value}
+        removed = [field for field in previous if field not in value]
+        if updated:
+            patch["update"][key] = updated
+        if removed:
+            patch["unset"][key] = removed
+    patch["delete"] = [key for key in old_data if key not in new_data]
+    return {name: part for name, part in patch.items() if part or name in ("file", "from", "to")}
+
+def register_patch(manifest_path, patch, patch_path):
+    """Add a patch to a datasync manifest so clients holding the old version can use it."""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    entry = manifest.setdefault("files", {}).setdefault(patch["file"], {})
+    relative = os.path.relpath(patch_path, os.path.dirname(os.path.abspath(manifest_path))).replace(os.sep, "/")
+    entry.setdefault("patches", {})[patch["from"]] = relative
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+# --- Main Function ---
+def main():
+    parser = argparse.ArgumentParser(description="Diff, merge and patch Autobeast mob files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = commands.add_parser("diff", help="show record/field differences")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+
+    merge_parser = commands.add_parser("merge", help="merge files, first file has the highest priority")
+    merge_parser.add_argument("sources", nargs="+")
+    merge_parser.add_argument("-o", "--output", required=True)
+    merge_parser.add_argument("--rule", action="append", metavar="FIELD=RULE",
+                              help=f"conflict rule per field or 'default' ({', '.join(MERGE_RULES)})")
+    merge_parser.add_argument("--common-only", action="store_true", help="keep only mobs present in every file")
+
+    patch_parser = commands.add_parser("patch", help="write a patch turning OLD into NEW")
+    patch_parser.add_argument("old")
+    patch_parser.add_argument("new")
+    patch_parser.add_argument("-o", "--output", required=True)
+    patch_parser.add_argument("--manifest", help="datasync manifest.json to register the patch in")
+
+    apply_parser = commands.add_parser("apply", help="apply a patch to a file in place")
+    apply_parser.add_argument("patch")
+    apply_parser.add_argument("file")
+
+    args = parser.parse_args()
+    if args.command == "diff":
+        old, new = load_dataset(args.old), load_dataset(args.new)
+        print(format_diff(diff_datasets(old, new), old, new))
+    elif args.command == "merge":
+        try:
+            rules = parse_rules(args.rule)
+        except ValueError as e:
+            parser.error(str(e))
+        datasets = [load_dataset(path) for path in args.sources]
+        merged, conflicts = merge_datasets(datasets, rules, args.common_only)
+        write_json(args.output, to_mob_file(merged, read_header(args.sources[0])))
+        print(f"Merged {len(merged)} mobs from {len(datasets)} files into {args.output}")
+        if conflicts:
+            print(f"{len(conflicts)} mobs had disagreeing values:")
+            for key, fields in conflicts.items():
+                print(f"  {merged[key]['name']}: {', '.join(fields)}")
+    elif args.command == "patch":
+        patch = build_patch(read_json(args.old), read_json(args.new), os.path.basename(args.old))
+        write_json(args.output, patch)
+        changes = len(patch.get("set", {})) + len(patch.get("delete", [])) + len(patch.get("update", {}) | patch.get("unset", {}))
+        print(f"Wrote {args.output}: {changes} records changed, {os.path.getsize(args.output)} bytes "
+              f"(full file {os.path.getsize(args.new)} bytes)")
+        if args.manifest:
+            register_patch(args.manifest, patch, args.output)
+            print(f"Registered in {args.manifest}")
+    elif args.command == "apply":
+        patch = read_json(args.patch)
+        data = read_json(args.file)
+        current = content_hash(args.file, json.dumps(data).encode("utf-8"))
+        if current != patch.get("from"):
+            sys.exit(f"{args.file} is not the version this patch starts from")
+        try:
+            data = apply_patch(data, patch)
+        except SyncError as e:
+            sys.exit(str(e))
+        if content_hash(args.file, json.dumps(data).encode("utf-8")) != patch.get("to"):
+            sys.exit("patched data does not match the patch's target hash; file left unchanged")
+        write_json(args.file, data)
+        print(f"Patched {args.file}")
+
+if __name__ == "__main__":
+    main()
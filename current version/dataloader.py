@@ -0,0 +1,118 @@
+import json
+import os
+import sys
+
+import perf
+import tasks
+
+# --- Background Dataset Loading ---
+# Every dataset is read and indexed on the shared "io" pool as soon as start_loading() is
+# called (gui.py does it before creating the window). Tabs ask for a dataset with
+# when_loaded() and fill in when its future resolves, instead of blocking the UI.
+futures = {}
+
+# Data lives next to the exe (frozen) or this file, not the working directory, so a shortcut
+# or start-menu launch from elsewhere still finds it
+if getattr(sys, 'frozen', False):
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "json")
+MOBS_JSON_PATH = os.path.join(DATA_DIR, "mobs.json")
+QUESTS_JSON_PATH = os.path.join(DATA_DIR, "quests.json")
+
+# With AUTOBEAST_SYNC=1 the data files are first brought up to date from the server at
+# AUTOBEAST_SYNC_URL (see datasync; without a URL the sync is skipped)
+SYNC_ENABLED = os.environ.get("AUTOBEAST_SYNC", "") == "1"
+
+# --- Dataset Loaders (run on the pool) ---
+def read_json(path):
+    """Read a JSON file, raising on any error so the failure reaches the tab."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def read_mobs():
+    """Read mobs.json, raising if it is missing, corrupt or not an object keyed by mob name."""
+    mobs_data = read_json(MOBS_JSON_PATH)
+    if not isinstance(mobs_data, dict):
+        raise ValueError(f"Unexpected data format in {MOBS_JSON_PATH}")
+    return mobs_data
+
+def read_quests():
+    """Read quests.json as a flat list of quests, raising on any error."""
+    from quest import flatten_quests
+
+    return flatten_quests(read_json(QUESTS_JSON_PATH))
+
+def load_mobs_dataset():
+    """mobs.json plus the indexes built from it: name index, loot index and zone aggregates."""
+    from quest import build_mob_name_index, build_loot_index
+    from zones import build_zone_aggregates
+
+    mobs_data = read_mobs()
+    members, aggregates = build_zone_aggregates(mobs_data)
+    return {
+        "mobs": mobs_data,
+        "name_index": build_mob_name_index(mobs_data),
+        "loot": build_loot_index(mobs_data),
+        "zone_members": members,
+        "zone_aggregates": aggregates,
+    }
+
+def load_quests_dataset():
+    """quests.json and the Quest tab's state (bestiary join, chains, search index, zone tables)."""
+    from quest import build_quest_state
+
+    quests = read_quests()
+    mobs_data = futures["mobs"].result()["mobs"]
+    return build_quest_state(quests, mobs_data)
+
+def load_recipes_dataset():
+    """Parse the selected recipe files into crafting's per-file cache."""
+    import crafting
+
+    tiers, recipes, tier_index = crafting.parse_files(crafting.selected_files)
+    crafting.remember_recipe_names(crafting.selected_files, recipes)
+    crafting.build_recipe_expansions(recipes)
+    return {"tiers": tiers, "recipes": recipes, "tier_index": tier_index}
+
+DATASET_LOADERS = {
+    "mobs": load_mobs_dataset,
+    "quests": load_quests_dataset,
+    "recipes": load_recipes_dataset,
+}
+
+# Pool per dataset (default "io"). The recipes loader fills crafting's caches, so it runs on
+# the single "cpu" worker with every other crafting calculation.
+DATASET_POOLS = {
+    "recipes": "cpu",
+}
+
+# --- Public API ---
+def start_loading():
+    """Submit every dataset loader to the background pool (only the first call does anything)."""
+    if futures:
+        return
+    sync_future = None
+    if SYNC_ENABLED:
+        import datasync
+        sync_future = futures["sync"] = tasks.get_pool("io").submit(perf.timed("load.sync")(datasync.sync), data_dir=DATA_DIR)
+
+    def run(loader):
+        if sync_future is not None:
+            sync_future.exception()  # Wait for the sync; it keeps the last good files on failure
+        return loader()
+
+    # "mobs" goes first: the quests loader waits on it
+    for name, loader in DATASET_LOADERS.items():
+        pool = tasks.get_pool(DATASET_POOLS.get(name, "io"))
+        futures[name] = pool.submit(run, perf.timed(f"load.{name}")(loader))
+
+def get_future(name):
+    """Return the future for a dataset, starting the loader if it hasn't been started."""
+    start_loading()
+    return futures[name]
+
+def when_loaded(widget, name, on_ready, on_error):
+    """Call on_ready(result) or on_error(exception) on the tk main loop once a dataset is loaded."""
+    tasks.call_when_done(widget, get_future(name), on_ready, on_error)
@@ -0,0 +1,313 @@
+import argparse
+import hashlib
+import http.client
+import http.server
+import json
+import os
+import shutil
+
+import httpclient
+
+# --- Delta Data Sync ---
+# Keeps the local json/ data current without a new build. A small manifest lists each data
+# file's content hash; only files whose hash differs from the local copy are downloaded, and
+# JSON files can be brought forward with a record-level patch instead of a full download.
+# Every request is conditional (If-None-Match / If-Modified-Since), so an unchanged manifest
+# costs one 304. New files are verified in a staging folder and swapped in together; any
+# failure leaves the last good local copy in place.
+#
+# Manifest (manifest.json next to the data files on the server):
+#   {"files": {"mobs.json": {"sha256": "...", "size": 12345,
+#                            "patches": {"<local sha256>": "patches/mobs-<from>-<to>.json"}}}}
+# Patch: {"file": "mobs.json", "from": "<sha256>", "to": "<sha256>", "set": {key: value}, "delete": [key],
+#         "update": {key: {field: value}}, "unset": {key: [field]}}   (datadiff.py writes these)
+#
+# There is no default server: set AUTOBEAST_SYNC_URL (or pass --url) to the folder holding the
+# published manifest, e.g. one served with "datasync.py --serve DIR". Without it sync is skipped.
+SYNC_BASE_URL = os.environ.get("AUTOBEAST_SYNC_URL", "").strip()
+MANIFEST_NAME = "manifest.json"
+DATA_DIR = "json"
+STATE_NAME = "sync_state.json"
+STAGING_DIR_NAME = ".sync-staging"
+LAST_GOOD_DIR_NAME = ".last-good"
+
+
+class SyncError(Exception):
+    pass
+
+
+# --- Hashing ---
+def canonical_json(data):
+    """Serialization used for hashing, so formatting differences don't count as changes."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def content_hash(name, content):
+    """sha256 of a data file: of its canonical JSON for .json files, of the raw bytes otherwise."""
+    if name.endswith(".json"):
+        content = canonical_json(json.loads(content))
+    return hashlib.sha256(content).hexdigest()
+
+def build_manifest(directory, patches=None):
+    """Return the manifest dict for every data file in directory (patches: name -> {from hash: path})."""
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name == MANIFEST_NAME or name.startswith(".") or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        files[name] = {"sha256": content_hash(name, content), "size": len(content)}
+        if patches and patches.get(name):
+            files[name]["patches"] = patches[name]
+    return {"files": files}
+
+# --- Patches ---
+def apply_patch(data, patch):
+    """
+    Apply a patch to a JSON object, keeping existing key order (new keys go last).
+
+    "delete" removes records, "set" adds or replaces whole records, and "update"/"unset"
+    change individual fields of existing records ({key: {field: value}} / {key: [field]}).
+    """
+    if not isinstance(data, dict):
+        raise SyncError("patches only apply to JSON objects")
+    result = dict(data)
+    for key in patch.get("delete", []):
+        result.pop(key, None)
+    result.update(patch.get("set", {}))
+    for key, fields in patch.get("update", {}).items():
+        if not isinstance(result.get(key), dict):
+            raise SyncError(f"patch updates a missing record: {key}")
+        result[key] = dict(result[key], **fields)
+    for key, fields in patch.get("unset", {}).items():
+        if not isinstance(result.get(key), dict):
+            raise SyncError(f"patch updates a missing record: {key}")
+        result[key] = {field: value for field, value in result[key].items() if field not in fields}
+    return result
+
+# --- HTTP ---
+def fetch(url, validators=None):
+    """
+    Conditional GET.
+
+    Returns:
+        tuple: (status, body, validators) where status 304 means "unchanged" (body is None)
+        and validators holds the response's ETag/Last-Modified for the next request.
+    """
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        status, response_headers, body = httpclient.request(url, headers)
+    except (OSError, httpclient.HttpError, http.client.HTTPException) as e:
+        raise SyncError(f"{url}: {e}")
+    if status == 304:
+        return 304, None, validators
+    if status != 200:
+        raise SyncError(f"{url}: HTTP {status}")
+    return status, body, {"etag": response_headers.get("etag"), "last_modified": response_headers.get("last-modified")}
+
+# --- Local State ---
+def load_state(data_dir):
+    try:
+        with open(os.path.join(data_dir, STATE_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"manifest": {}, "files": {}}
+
+def save_state(data_dir, state):
+    path = os.path.join(data_dir, STATE_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def local_hash(data_dir, name):
+    """Hash of the local copy of a data file, or None if it is missing or unreadable."""
+    try:
+        with open(os.path.join(data_dir, name), "rb") as f:
+            return content_hash(name, f.read())
+    except (OSError, ValueError):
+        return None
+
+# --- Sync ---
+def download_file(base_url, data_dir, name, entry, current_hash, file_state):
+    """Fetch the new content of one file (via a patch when one starts from our copy); returns bytes."""
+    patch_path = (entry.get("patches") or {}).get(current_hash or "")
+    if patch_path:
+        try:
+            status, body, _ = fetch(base_url + patch_path)
+            with open(os.path.join(data_dir, name), "r", encoding="utf-8") as f:
+                patched = apply_patch(json.load(f), json.loads(body))
+            content = json.dumps(patched, indent=4, ensure_ascii=False).encode("utf-8")
+            if content_hash(name, content) == entry["sha256"]:
+                return content, {}
+            print(f"Sync: patch for {name} did not produce the expected data; downloading the full file")
+        except (SyncError, OSError, ValueError) as e:
+            print(f"Sync: patch for {name} failed ({e}); downloading the full file")
+
+    status, body, validators = fetch(base_url + name, file_state.get(name))
+    if status == 304:
+        raise SyncError(f"{name}: server says unchanged but the manifest hash differs")
+    return body, validators
+
+def swap_in(data_dir, staged):
+    """Move staged files into place, keeping the replaced copies as the last good versions."""
+    last_good_dir = os.path.join(data_dir, LAST_GOOD_DIR_NAME)
+    os.makedirs(last_good_dir, exist_ok=True)
+    replaced = []
+    try:
+        for name, staged_path in staged.items():
+            target = os.path.join(data_dir, name)
+            if os.path.exists(target):
+                shutil.copy2(target, os.path.join(last_good_dir, name))
+            os.replace(staged_path, target)  # Atomic per file
+            replaced.append(name)
+    except OSError:
+        # Put back what was already swapped so the set of files stays consistent
+        for name in replaced:
+            backup = os.path.join(last_good_dir, name)
+            if os.path.exists(backup):
+                shutil.copy2(backup, os.path.join(data_dir, name))
+        raise
+
+def sync(base_url=SYNC_BASE_URL, data_dir=DATA_DIR):
+    """
+    Bring data_dir up to date with the manifest at base_url.
+
+    Returns:
+        list: names of the files that were updated (empty when already current, offline or
+        no URL is configured). Errors are printed and the local files are left untouched.
+    """
+    if not base_url:
+        print("Sync: no data URL configured (set AUTOBEAST_SYNC_URL); keeping local data")
+        return []
+    if not base_url.endswith("/"):
+        base_url += "/"
+    state = load_state(data_dir)
+    try:
+        status, body, validators = fetch(base_url + MANIFEST_NAME, state.get("manifest"))
+        if status == 304:
+            return []
+        manifest = json.loads(body)
+        entries = manifest["files"]
+    except (SyncError, ValueError, KeyError) as e:
+        print(f"Sync: manifest unavailable, keeping local data ({e})")
+        return []
+
+    staging_dir = os.path.join(data_dir, STAGING_DIR_NAME)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    staged = {}
+    try:
+        for name, entry in entries.items():
+            if os.path.basename(name) != name:
+                raise SyncError(f"refusing file outside the data folder: {name}")
+            current_hash = local_hash(data_dir, name)
+            if current_hash == entry.get("sha256"):
+                continue
+            content, file_validators = download_file(base_url, data_dir, name, entry, current_hash, state["files"])
+            if content_hash(name, content) != entry.get("sha256"):
+                raise SyncError(f"{name}: downloaded content does not match the manifest hash")
+            staged[name] = os.path.join(staging_dir, name)
+            with open(staged[name], "wb") as f:
+                f.write(content)
+            state["files"][name] = file_validators
+        if staged:
+            swap_in(data_dir, staged)
+    except (SyncError, OSError, ValueError) as e:
+        print(f"Sync failed, keeping the last good local data ({e})")
+        return []
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # Only remember the manifest's validators once everything it lists is in place
+    state["manifest"] = validators
+    save_state(data_dir, state)
+    return sorted(staged)
+
+def restore_last_good(data_dir=DATA_DIR):
+    """Copy the last good versions back over the current data files; returns the names restored."""
+    last_good_dir = os.path.join(data_dir, LAST_GOOD_DIR_NAME)
+    if not os.path.isdir(last_good_dir):
+        return []
+    restored = []
+    for name in sorted(os.listdir(last_good_dir)):
+        shutil.copy2(os.path.join(last_good_dir, name), os.path.join(data_dir, name) + ".tmp")
+        os.replace(os.path.join(data_dir, name) + ".tmp", os.path.join(data_dir, name))
+        restored.append(name)
+    # Forget the manifest validators so the next sync re-checks everything
+    state = load_state(data_dir)
+    state["manifest"] = {}
+    save_state(data_dir, state)
+    return restored
+
+# --- Stand-in Server ---
+class DataRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file server that sends ETag/Last-Modified and answers conditional requests with 304."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, like a real CDN
+
+    def send_head(self):
+        self.etag = None
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            if self.headers.get("If-None-Match") == self.etag:
+                self.send_response(304)
+                self.end_headers()
+                return None
+        return super().send_head()
+
+    def end_headers(self):
+        if getattr(self, "etag", None):
+            self.send_header("ETag", self.etag)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(directory, port=8000):
+    """Serve a data folder (with its manifest) the way the sync expects; for testing and self-hosting."""
+    handler = lambda *args, **kwargs: DataRequestHandler(*args, directory=directory, **kwargs)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    return server
+
+# --- Main Function ---
+def main():
+    parser = argparse.ArgumentParser(description="Sync or publish Autobeast data files.")
+    parser.add_argument("--url", default=SYNC_BASE_URL, help="base URL holding manifest.json")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--manifest", metavar="DIR", help="write DIR/manifest.json for publishing and exit")
+    parser.add_argument("--serve", metavar="DIR", help="serve DIR on localhost as a stand-in data server")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--restore", action="store_true", help="restore the last good local data")
+    args = parser.parse_args()
+
+    if args.manifest:
+        path = os.path.join(args.manifest, MANIFEST_NAME)
+        previous = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                previous = {name: entry.get("patches") for name, entry in json.load(f)["files"].items()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(build_manifest(args.manifest, previous), f, indent=2)
+        print(f"Wrote {path}")
+    elif args.serve:
+        server = serve(args.serve, args.port)
+        print(f"Serving {args.serve} on http://127.0.0.1:{args.port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    elif args.restore:
+        print(f"Restored: {', '.join(restore_last_good(args.data_dir)) or 'nothing'}")
+    elif not args.url:
+        parser.error("no data URL: pass --url or set AUTOBEAST_SYNC_URL")
+    else:
+        print(f"Updated: {', '.join(sync(args.url, args.data_dir)) or 'nothing'}")
+
+if __name__ == "__main__":
+    main()
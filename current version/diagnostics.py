@@ -0,0 +1,77 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+import perf
+
+REFRESH_MS = 1000
+COLUMNS = (("metric", "Metric", 200), ("count", "Count", 70), ("p50", "p50", 90), ("p95", "p95", 90),
+           ("p99", "p99", 90), ("max", "Max", 90))
+
+# --- Create Diagnostics Tab ---
+def create_diagnostics_tab(parent):
+    """Creates the Diagnostics tab in the GUI."""
+    tab_diagnostics = ttk.Frame(parent, style="Dark.TFrame")
+    parent.add(tab_diagnostics, text="📈 Diagnostics")
+    build_diagnostics_tab(tab_diagnostics)
+
+def build_diagnostics_tab(tab_diagnostics):
+    """Builds the Diagnostics tab's widgets inside an existing frame."""
+    style = ttk.Style()
+    style.configure("Dark.TCheckbutton", background="#000000", foreground="#00FF00", font=("Lucida Console", 10))
+    style.configure("Dark.Treeview", background="#000000", fieldbackground="#000000", foreground="#00FF00",
+                    font=("Lucida Console", 10))
+    style.configure("Dark.Treeview.Heading", background="#000000", foreground="#00FF00", font=("Lucida Console", 10))
+
+    button_frame = tk.Frame(tab_diagnostics, bg="#000000")
+    button_frame.pack(side="top", fill="x", padx=10, pady=(10, 0))
+
+    recording_var = tk.BooleanVar(value=perf.enabled())
+    ttk.Checkbutton(button_frame, text="Record timings", variable=recording_var, style="Dark.TCheckbutton",
+                    command=lambda: perf.set_enabled(recording_var.get())).pack(side="left")
+
+    status_label = tk.Label(button_frame, text="", font=("Lucida Console", 10), fg="#00FF00", bg="#000000")
+
+    metric_tree = ttk.Treeview(tab_diagnostics, columns=[c[0] for c in COLUMNS], show="headings",
+                               selectmode="none", style="Dark.Treeview")
+    for column, heading, width in COLUMNS:
+        metric_tree.heading(column, text=heading)
+        metric_tree.column(column, width=width, anchor="w", stretch=column == "metric")
+    metric_tree.pack(side="top", fill="both", expand=True, padx=10, pady=10)
+
+    def refresh():
+        metric_tree.delete(*metric_tree.get_children())
+        for name, summary in perf.snapshot().items():
+            unit = summary["unit"]
+            metric_tree.insert("", "end", values=(
+                name, summary["count"],
+                *(perf.format_value(summary[key], unit) for key in ("p50", "p95", "p99", "max"))
+            ))
+
+    def auto_refresh():
+        # Only redraw while the tab is on screen
+        if not tab_diagnostics.winfo_exists():
+            return
+        if tab_diagnostics.winfo_viewable():
+            refresh()
+        tab_diagnostics.after(REFRESH_MS, auto_refresh)
+
+    def reset():
+        perf.reset()
+        refresh()
+
+    def export():
+        path = filedialog.asksaveasfilename(title="Export timings", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")], initialfile="autobeast_perf.json")
+        if not path:
+            return
+        try:
+            status_label.config(text=f"Exported to {perf.export_json(path)}")
+        except OSError as e:
+            status_label.config(text=f"Export failed: {e}")
+
+    for text, command in (("🔄 Refresh", refresh), ("🧹 Reset", reset), ("💾 Export JSON", export)):
+        tk.Button(button_frame, text=text, bg="#555555", fg="#00FF00", font=("Lucida Console", 10),
+                  command=command).pack(side="left", padx=5)
+    status_label.pack(side="left", padx=5)
+
+    auto_refresh()
@@ -1,51 +1,138 @@
+import time
+
+START_TIME = time.perf_counter()  # Taken before any other import, for the first-paint measurement
+
 import os
+import sys
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
 
-# Import the refactored modules
-from abdetect import create_detect_tab
-from bestiary import create_bestiary_tab
-from quest import create_quest_tab
-from crafting import create_crafting_tab  # Import the crafting tab
+import dataloader
+import tasks
+
+# Tab builders. Each imports its module inside the function, so heavy modules stay out of
+# startup; the imports are still literal so PyInstaller finds and bundles them.
+def build_detect(frame):
+    import abdetect
+    abdetect.build_detect_tab(frame)
+
+def build_bestiary(frame):
+    import bestiary
+    bestiary.build_bestiary_tab(frame)
+
+def build_zones(frame):
+    import zones
+    zones.build_zones_tab(frame)
+
+def build_quest(frame):
+    import quest
+    quest.build_quest_tab(frame)
+
+def build_crafting(frame):
+    import crafting
+    crafting.build_crafting_tab(frame)
+
+def build_diagnostics(frame):
+    import diagnostics
+    diagnostics.build_diagnostics_tab(frame)
+
+# Tabs in display order: (title, builder). Each tab is built the first time it is selected.
+TABS = [
+    ("🧪 Detect", build_detect),
+    ("📖 Bestiary", build_bestiary),
+    ("🌍 Zones", build_zones),
+    ("🗺️ Quest", build_quest),
+    ("🛠️ Crafting", build_crafting),
+    ("📈 Diagnostics", build_diagnostics),
+]
+
+STARTUP_LOG_PATH = os.path.join(dataloader.BASE_DIR, "startup.log")
+
+
+def report_first_paint(root):
+    """Report the time from process start to the first painted window."""
+    root.update_idletasks()  # Flush pending redraws so the window is actually painted
+    elapsed_ms = (time.perf_counter() - START_TIME) * 1000
+    mode = "frozen exe" if getattr(sys, 'frozen', False) else "script"
+    message = f"First paint ({mode}): {elapsed_ms:.0f} ms"
+    print(message)
+    if getattr(sys, 'frozen', False):
+        # Windowed builds have no console, so keep a log next to the exe
+        try:
+            with open(STARTUP_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+        except OSError:
+            pass
+
+
+def build_tab(frame, title, builder):
+    """Build a tab (importing its module) into its placeholder frame."""
+    frame.update_idletasks()  # Paint the "Loading..." placeholder before the (slow) build
+    for child in frame.winfo_children():
+        child.destroy()
+    try:
+        builder(frame)
+    except Exception as e:
+        print(f"Error loading {title.split(' ', 1)[-1]} tab: {e}")
+        tk.Label(frame, text=f"Error loading tab: {e}", font=("Lucida Console", 11),
+                 fg="#00FF00", bg="#000000").pack(anchor="w", padx=10, pady=10)
 
 
 def create_gui():
-    """Create the unified GUI with tabs for Detect, Bestiary, Quest, and Crafting."""
+    """Create the unified GUI with tabs for Detect, Bestiary, Zones, Quest, Crafting, and Diagnostics."""
     root = tk.Tk()
     root.title("Autobeast Unified GUI")
     root.geometry("800x600")
     root.configure(bg="#2B2B2B")
     root.attributes("-topmost", True)  # Always keep the GUI on top of other windows
 
+    # Deliver background task results on this window's event loop
+    tasks.install(root)
+
+    style = ttk.Style()
+    style.configure("Dark.TFrame", background="#000000")
+
     # Create a notebook for tabs
     notebook = ttk.Notebook(root)
     notebook.pack(expand=True, fill="both")
 
-    # Add tabs from each module
-    try:
-        create_detect_tab(notebook)
-    except Exception as e:
-        print(f"Error loading Detect tab: {e}")
+    # Add a lightweight placeholder per tab; the real tab is built on first selection
+    pending = {}
+    for title, builder in TABS:
+        frame = ttk.Frame(notebook, style="Dark.TFrame")
+        tk.Label(frame, text="Loading...", font=("Lucida Console", 11), fg="#00FF00", bg="#000000").pack(
+            anchor="w", padx=10, pady=10)
+        notebook.add(frame, text=title)
+        pending[str(frame)] = (frame, title, builder)
 
-    try:
-        create_bestiary_tab(notebook)
-    except Exception as e:
-        print(f"Error loading Bestiary tab: {e}")
+    def on_tab_changed(event=None):
+        selected = pending.pop(notebook.select(), None)
+        if selected:
+            root.after(0, build_tab, *selected)
 
-    try:
-        create_quest_tab(notebook)
-    except Exception as e:
-        print(f"Error loading Quest tab: {e}")
-
-    try:
-        create_crafting_tab(notebook)  # Add the crafting tab
-    except Exception as e:
-        print(f"Error loading Crafting tab: {e}")
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+    root.after(0, report_first_paint, root)
 
     return root
 
 
 if __name__ == "__main__":
+    # Needed for the crafting batch process pool in the frozen exe
+    multiprocessing.freeze_support()
+
+    # Start reading and indexing every dataset in the background before building the window
+    dataloader.start_loading()
+
+    # Optional local query API for other tools (off unless a port is given)
+    api_port = os.environ.get("AUTOBEAST_API_PORT", "").strip()
+    if api_port.isdigit():
+        import api
+        api.start_in_background(port=int(api_port))
+
     # Launch the GUI
     root = create_gui()
     root.mainloop()
+    if api_port.isdigit():
+        api.stop()
+    tasks.shutdown()
@@ -0,0 +1,217 @@
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+
+import tasks
+
+# --- Shared HTTP Client ---
+# One keep-alive connection pool per host and an on-disk HTTP cache, so repeat fetches of the
+# same URL (map images, mostly) reuse a connection and usually skip the network: a response
+# still fresh per Cache-Control/Expires (or the usual 10%-of-age heuristic for Last-Modified)
+# costs no request, and a stale one costs one conditional request answered by a 304.
+CACHE_DIR = os.path.join("cache", "http")
+REQUEST_TIMEOUT = 10
+MAX_IDLE_PER_HOST = 4
+MAX_REDIRECTS = 5
+HEURISTIC_FRACTION = 0.1      # Of the time since Last-Modified, when the server gives no lifetime
+MAX_HEURISTIC_SECONDS = 86400
+USER_AGENT = "Autobeast"
+
+idle_connections = {}
+pool_lock = threading.Lock()
+
+
+class HttpError(Exception):
+    def __init__(self, url, status, message=""):
+        super().__init__(f"{url}: HTTP {status}{' ' + message if message else ''}")
+        self.status = status
+
+
+# --- Connection Pool ---
+def new_connection(scheme, netloc):
+    connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return connection_class(netloc, timeout=REQUEST_TIMEOUT)
+
+def take_connection(scheme, netloc):
+    """Return (connection, reused): an idle pooled connection to the host, or a new one."""
+    with pool_lock:
+        idle = idle_connections.get((scheme, netloc))
+        if idle:
+            return idle.pop(), True
+    return new_connection(scheme, netloc), False
+
+def release_connection(scheme, netloc, connection):
+    with pool_lock:
+        idle = idle_connections.setdefault((scheme, netloc), [])
+        if len(idle) < MAX_IDLE_PER_HOST:
+            idle.append(connection)
+            return
+    connection.close()
+
+def close_all():
+    """Close every pooled connection."""
+    with pool_lock:
+        for idle in idle_connections.values():
+            for connection in idle:
+                connection.close()
+        idle_connections.clear()
+
+def request(url, headers=None, method="GET"):
+    """
+    Send one request over a pooled connection, following redirects.
+
+    Returns:
+        tuple: (status, headers as a lowercase-keyed dict, body bytes)
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise HttpError(url, 0, "unsupported URL")
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        send_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+        send_headers.update(headers or {})
+
+        connection, reused = take_connection(parts.scheme, parts.netloc)
+        try:
+            try:
+                connection.request(method, path, headers=send_headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest):
+                if not reused:
+                    raise
+                # A pooled connection the server already closed: retry once on a fresh one
+                connection.close()
+                connection = new_connection(parts.scheme, parts.netloc)
+                connection.request(method, path, headers=send_headers)
+                response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        if response.will_close:
+            connection.close()
+        else:
+            release_connection(parts.scheme, parts.netloc, connection)
+
+        if response.status in (301, 302, 303, 307, 308) and "location" in response_headers:
+            url = urllib.parse.urljoin(url, response_headers["location"])
+            continue
+        return response.status, response_headers, body
+    raise HttpError(url, 0, "too many redirects")
+
+# --- Disk Cache ---
+def cache_paths(url, cache_dir):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".body"), os.path.join(cache_dir, key + ".json")
+
+def read_cache(url, cache_dir):
+    body_path, meta_path = cache_paths(url, cache_dir)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return meta, f.read()
+    except (OSError, ValueError):
+        return None, None
+
+def write_cache(url, cache_dir, meta, body=None):
+    """Store the entry; body None keeps the cached body (after a 304)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = cache_paths(url, cache_dir)
+    try:
+        if body is not None:
+            with open(body_path + ".tmp", "wb") as f:
+                f.write(body)
+            os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+    except OSError as e:
+        print(f"Error writing HTTP cache for {url}: {e}")
+
+def parse_http_date(value):
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def freshness_lifetime(headers, now):
+    """Seconds a response may be reused without asking the server (0 = always revalidate)."""
+    cache_control = {
+        part.strip().split("=", 1)[0].lower(): part.strip().split("=", 1)[1] if "=" in part else ""
+        for part in headers.get("cache-control", "").split(",") if part.strip()
+    }
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    if "max-age" in cache_control:
+        try:
+            return max(0, int(cache_control["max-age"].strip('"')))
+        except ValueError:
+            return 0
+    expires = parse_http_date(headers.get("expires"))
+    if expires is not None:
+        return max(0, expires - (parse_http_date(headers.get("date")) or now))
+    last_modified = parse_http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return min(MAX_HEURISTIC_SECONDS, max(0, (now - last_modified) * HEURISTIC_FRACTION))
+    return 0
+
+def cache_meta(url, headers, now):
+    return {
+        "url": url,
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+        "stored_at": now,
+        "fresh_until": now + freshness_lifetime(headers, now),
+        "no_store": "no-store" in headers.get("cache-control", "").lower(),
+    }
+
+def get(url, cache_dir=CACHE_DIR):
+    """
+    GET url through the disk cache and return the body (runs on a worker thread).
+
+    A fresh cached copy is returned without a request; a stale one is revalidated with
+    If-None-Match/If-Modified-Since and reused on 304. If the network fails, a cached copy
+    (even a stale one) is returned rather than failing.
+    """
+    now = time.time()
+    meta, cached_body = read_cache(url, cache_dir)
+    if meta is not None and now < meta.get("fresh_until", 0):
+        return cached_body
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        status, response_headers, body = request(url, headers)
+    except (OSError, http.client.HTTPException) as e:
+        if cached_body is not None:
+            print(f"Using cached copy of {url} ({e})")
+            return cached_body
+        raise
+
+    if status == 304 and cached_body is not None:
+        # Keep the stored validators unless the server sent new ones
+        merged = {"etag": meta.get("etag"), "last-modified": meta.get("last_modified")}
+        merged.update(response_headers)
+        write_cache(url, cache_dir, cache_meta(url, merged, now))
+        return cached_body
+    if status != 200:
+        raise HttpError(url, status)
+    new_meta = cache_meta(url, response_headers, now)
+    if not new_meta["no_store"]:
+        write_cache(url, cache_dir, new_meta, body)
+    return body
+
+def get_async(widget, url, on_done, on_error=None):
+    """Fetch url on the io pool and deliver the body to on_done on the tk main loop."""
+    return tasks.run_task(widget, "io", get, url, on_done=on_done, on_error=on_error)
@@ -0,0 +1,185 @@
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+# --- Performance Instrumentation ---
+# Timing spans and counters for the hot paths, kept in fixed-size log-scale histograms so
+# recording is O(1) and memory never grows. Recording is off unless AUTOBEAST_PERF=1 or the
+# Diagnostics tab switches it on; while off, span() hands back a shared no-op context and
+# timed() wrappers cost one flag check.
+state = {"enabled": os.environ.get("AUTOBEAST_PERF", "") == "1"}
+
+BUCKETS_PER_DOUBLING = 4   # ~19% bucket width, so percentiles are within ~10% of the true value
+MIN_VALUE = 1e-6           # Smallest value with its own bucket (1 µs for spans)
+BUCKET_COUNT = 160         # 40 doublings: 1 µs .. ~12 days, or 1 .. ~10^12 for counters
+
+# Units shown in the Diagnostics tab: spans are recorded in seconds, counters as plain numbers
+UNIT_SECONDS = "s"
+UNIT_COUNT = "count"
+
+histograms = {}
+histogram_lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-size log-bucketed histogram with exact count/sum/min/max."""
+
+    def __init__(self, unit):
+        self.unit = unit
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value):
+        if value <= MIN_VALUE:
+            index = 0
+        else:
+            index = min(BUCKET_COUNT - 1, int(math.log2(value / MIN_VALUE) * BUCKETS_PER_DOUBLING) + 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """Approximate percentile: the geometric middle of the bucket holding it, clamped to min/max."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if hits and seen >= rank:
+                if index == 0:
+                    return self.min
+                middle = MIN_VALUE * 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING)
+                return max(self.min, min(self.max, middle))
+        return self.max
+
+    def summary(self):
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+# --- Recording ---
+def enabled():
+    return state["enabled"]
+
+def set_enabled(value):
+    state["enabled"] = bool(value)
+
+def record(name, value, unit=UNIT_SECONDS):
+    """Add one value to the named histogram (no-op while recording is off)."""
+    if not state["enabled"]:
+        return
+    with histogram_lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram(unit)
+        histogram.add(value)
+
+def count(name, value):
+    """Record a per-event count, e.g. controls seen in one scan tick."""
+    record(name, value, UNIT_COUNT)
+
+
+class Span:
+    """Times the enclosed block into a histogram."""
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = NullSpan()
+
+def span(name):
+    """Context manager timing a block as the named metric."""
+    return Span(name) if state["enabled"] else NULL_SPAN
+
+def timed(name):
+    """Decorator timing every call of a function as the named metric."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not state["enabled"]:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+# --- Reporting ---
+def snapshot():
+    """Return {metric name: summary dict} for every recorded metric, sorted by name."""
+    with histogram_lock:
+        return {name: histograms[name].summary() for name in sorted(histograms)}
+
+def reset():
+    with histogram_lock:
+        histograms.clear()
+
+def export_json(path):
+    """Write every metric's summary and raw bucket counts to a JSON file for offline analysis."""
+    with histogram_lock:
+        metrics = {
+            name: dict(histogram.summary(), buckets={
+                str(index): hits for index, hits in enumerate(histogram.buckets) if hits
+            })
+            for name, histogram in sorted(histograms.items())
+        }
+    data = {
+        "exported_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "bucket_scheme": {"min_value": MIN_VALUE, "buckets_per_doubling": BUCKETS_PER_DOUBLING,
+                          "bucket_count": BUCKET_COUNT},
+        "metrics": metrics,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+def format_value(value, unit):
+    """Human-readable value for the Diagnostics tab."""
+    if unit != UNIT_SECONDS:
+        return f"{value:.0f}" if value == int(value) else f"{value:.1f}"
+    if value >= 1:
+        return f"{value:.2f} s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.1f} ms"
+    return f"{value * 1e6:.0f} µs"
@@ -2,32 +2,136 @@ import os
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
 import json
+import math
+import re
 
-LOCAL_JSON_DIR = "json"
-QUESTS_JSON_PATH = os.path.join(LOCAL_JSON_DIR, "quests.json")
+import dataloader
+import perf
+import tasks
+
+LOCAL_JSON_DIR = dataloader.DATA_DIR
+QUESTS_JSON_PATH = dataloader.QUESTS_JSON_PATH
+MOBS_JSON_PATH = dataloader.MOBS_JSON_PATH
+
+# Objective keywords used in the "task" field. The data often runs sections
+# together (e.g. "Wandering SpiritCollect: ..."), so no word boundary is required.
+TASK_SECTION_RE = re.compile(r"(Kill|Slay|Collect|Find|Deliver|Return Item|Obtain)\s*:")
+TASK_ENTRY_RE = re.compile(r"^(\d+)?\s*(.*)$")
+KILL_SECTIONS = ("Kill", "Slay")
+
+# Full-text search: split run-together words ("SpiritCollect", "200kGold") into tokens
+TOKEN_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+[a-z]*")
+SEARCH_FIELD_WEIGHTS = {"quest_name": 2, "giver": 1, "task": 1, "reward": 1}
+BM25_K1 = 1.2
+BM25_B = 0.75
+SEARCH_CACHE_SIZE = 256
 
 # --- Load JSON ---
+def flatten_quests(data):
+    """Flatten quests JSON (a list, or categories of lists) into a list of quest dicts."""
+    # Ensure the data is a list of dictionaries
+    if isinstance(data, list):
+        return [q for q in data if isinstance(q, dict)]
+    elif isinstance(data, dict):
+        flattened_data = []
+        for category, quests in data.items():
+            if isinstance(quests, list):
+                flattened_data.extend([q for q in quests if isinstance(q, dict)])
+        return flattened_data
+    else:
+        raise ValueError("Unexpected data format")
+
 def load_quests():
     """Fetch the quests JSON from the local json directory."""
     try:
         with open(QUESTS_JSON_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Ensure the data is a list of dictionaries
-        if isinstance(data, list):
-            return [q for q in data if isinstance(q, dict)]
-        elif isinstance(data, dict):
-            flattened_data = []
-            for category, quests in data.items():
-                if isinstance(quests, list):
-                    flattened_data.extend([q for q in quests if isinstance(q, dict)])
-            return flattened_data
-        else:
-            raise ValueError("Unexpected data format")
+            return flatten_quests(json.load(f))
     except Exception as e:
         print(f"Error loading JSON: {e}")
         return []
 
+def load_mobs():
+    """Fetch the mobs JSON from the local json directory."""
+    try:
+        with open(MOBS_JSON_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading JSON: {e}")
+        return {}
+
+# --- Parse Task Objectives ---
+def parse_task(task):
+    """Split a task string into (section, name, count) objectives."""
+    objectives = []
+    parts = TASK_SECTION_RE.split(task or "")
+    # parts = [prefix, section, body, section, body, ...]
+    for i in range(1, len(parts) - 1, 2):
+        section = parts[i]
+        for entry in parts[i + 1].split(","):
+            match = TASK_ENTRY_RE.match(entry.strip())
+            name = match.group(2).strip()
+            if not name:
+                continue
+            count = int(match.group(1)) if match.group(1) else 1
+            objectives.append((section, name, count))
+    return objectives
+
+# --- Quest / Bestiary Join ---
+def build_mob_name_index(mobs_data):
+    """Map normalized mob names to their key in mobs_data (skips the header row)."""
+    return {
+        name.strip().lower(): name
+        for name, info in mobs_data.items()
+        if isinstance(info, dict) and info.get("Level") != "Lvl"
+    }
+
+def build_quest_mob_join(quests_data, mobs_data):
+    """
+    Resolve every quest's kill targets against mobs_data once.
+
+    Returns:
+        tuple: (join, unresolved) where join is a list parallel to quests_data holding
+        (target, count, mob_name, mob_info) tuples (mob_name/mob_info are None when the
+        target is unknown), and unresolved maps each unknown target to the quest IDs
+        that reference it.
+    """
+    name_index = build_mob_name_index(mobs_data)
+    join = []
+    unresolved = {}
+    for quest in quests_data:
+        targets = []
+        for section, target, count in parse_task(quest.get("task", "")):
+            if section not in KILL_SECTIONS:
+                continue
+            mob_name = name_index.get(target.lower())
+            if mob_name is None:
+                unresolved.setdefault(target, []).append(quest.get("quest_#", "?"))
+                targets.append((target, count, None, None))
+            else:
+                targets.append((target, count, mob_name, mobs_data[mob_name]))
+        join.append(targets)
+    return join, unresolved
+
+def build_loot_index(mobs_data):
+    """Map normalized loot item names to the mob names that drop them."""
+    loot_index = {}
+    for name, mob_name in build_mob_name_index(mobs_data).items():
+        for drop in mobs_data[mob_name].get("Loot Drops") or []:
+            for item in drop.split(","):
+                item = item.strip().lower()
+                if item:
+                    loot_index.setdefault(item, []).append(mob_name)
+    return loot_index
+
+def format_unresolved_targets(unresolved):
+    """Format the unresolved kill targets as a data-quality report."""
+    if not unresolved:
+        return "All quest kill targets resolved to a bestiary entry.\n"
+    lines = [f"Unresolved kill targets ({len(unresolved)}):"]
+    for target in sorted(unresolved, key=str.lower):
+        lines.append(f"  {target}  (quests: {', '.join(unresolved[target])})")
+    return "\n".join(lines) + "\n"
+
 # --- Parse Level Range ---
 def parse_level_range(level_range):
     """Parse a level range string (e.g., '1-13') into min and max levels."""
@@ -42,35 +146,331 @@ def parse_level_range(level_range):
     except ValueError:
         return None, None
 
-# --- Search Function ---
-def search_quests(qid, qtype, region, level_range, only_repeatable, quest_results, quests_data):
-    """Search for quests based on the given criteria."""
-    quest_results.config(state=tk.NORMAL)
-    quest_results.delete("1.0", tk.END)
+# --- Quest Chain Graph ---
+def normalize_quest_id(qid):
+    """Normalize a quest ID for chain lookups ('0463' and '463' are the same quest)."""
+    qid = str(qid).strip()
+    return (qid.lstrip("0") or "0") if qid.isdigit() else qid
+
+def build_chain_graph(quests_data):
+    """
+    Build the quest chain DAG from each quest's "chain" field (its follow-up quests).
+
+    Transitive prerequisites and follow-ups are computed once, in topological order,
+    so later lookups are plain dict reads.
+
+    Returns:
+        dict: "prereqs" and "unlocks" map a quest ID to a topologically ordered tuple of
+        quest IDs; "broken" lists (quest ID, missing chain ID) pairs; "cycles" lists the
+        quest IDs on a cycle. Quests on or below a cycle get no closure, and closures
+        above one stop short of it.
+    """
+    quest_ids = {
+        normalize_quest_id(q.get("quest_#", "")) for q in quests_data if q.get("quest_#", "").strip().isdigit()
+    }
+    follow_ups = {qid: [] for qid in quest_ids}
+    parents = {qid: [] for qid in quest_ids}
+    broken = []
+    for quest in quests_data:
+        qid = normalize_quest_id(quest.get("quest_#", ""))
+        if qid not in quest_ids:
+            continue
+        for ref in quest.get("chain", "").split(","):
+            ref = ref.strip()
+            if not ref.isdigit():  # "None", "???" and friends
+                continue
+            ref = normalize_quest_id(ref)
+            if ref not in quest_ids:
+                broken.append((quest.get("quest_#"), ref))
+            elif ref not in follow_ups[qid]:
+                follow_ups[qid].append(ref)
+                parents[ref].append(qid)
+
+    # Kahn's algorithm; whatever never reaches in-degree 0 sits on a cycle
+    in_degree = {qid: len(parents[qid]) for qid in quest_ids}
+    order = [qid for qid in sorted(quest_ids, key=int) if in_degree[qid] == 0]
+    for qid in order:
+        for child in follow_ups[qid]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                order.append(child)
+    position = {qid: i for i, qid in enumerate(order)}
+
+    # Kahn also leaves out everything downstream of a cycle; report only quests that lead back to themselves
+    leftover = quest_ids - position.keys()
+    cycles = []
+    for qid in sorted(leftover, key=int):
+        seen = set()
+        stack = [child for child in follow_ups[qid] if child in leftover]
+        while stack and qid not in seen:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(child for child in follow_ups[node] if child in leftover)
+        if qid in seen:
+            cycles.append(qid)
+
+    prereqs = {}
+    for qid in order:
+        found = set()
+        for parent in parents[qid]:
+            found.add(parent)
+            found.update(prereqs[parent])
+        prereqs[qid] = tuple(sorted(found, key=position.get))
+    unlocks = {}
+    for qid in reversed(order):
+        found = set()
+        for child in follow_ups[qid]:
+            if child not in position:  # On or below a cycle: no closure to build on
+                continue
+            found.add(child)
+            found.update(unlocks[child])
+        unlocks[qid] = tuple(sorted(found, key=position.get))
 
+    return {"prereqs": prereqs, "unlocks": unlocks, "broken": broken, "cycles": cycles}
+
+def format_chain_issues(chain_graph):
+    """Format broken chain references and cycles as a data-quality report."""
+    lines = []
+    if chain_graph["broken"]:
+        lines.append(f"Broken chain references ({len(chain_graph['broken'])}):")
+        for qid, ref in chain_graph["broken"]:
+            lines.append(f"  {qid} -> {ref} (no such quest)")
+    if chain_graph["cycles"]:
+        lines.append(f"Quests on a chain cycle: {', '.join(chain_graph['cycles'])}")
+    if not lines:
+        return "Quest chains form a valid DAG.\n"
+    return "\n".join(lines) + "\n"
+
+# --- Route Planner ---
+def quest_level(quest):
+    """Return the quest level as an int, or None when unknown (e.g. '??')."""
+    lvl = quest.get("lvl", "").strip()
+    return int(lvl) if lvl.isdigit() else None
+
+def build_zone_tables(quests_data, quest_mob_join, mobs_data):
+    """
+    Precompute where each quest's kill/collect objectives can be done.
+
+    Returns:
+        tuple: (quest_objectives, zone_objectives). quest_objectives maps a quest index to a
+        list of (section, name, count, zones) tuples, where zones is the set of Locations
+        satisfying the objective (empty when unknown). zone_objectives maps each Location
+        to the set of (quest index, objective index) pairs it satisfies.
+    """
+    loot_index = build_loot_index(mobs_data)
+    quest_objectives = {}
+    zone_objectives = {}
+    for idx, quest in enumerate(quests_data):
+        kills = iter(quest_mob_join[idx])
+        objectives = []
+        for section, name, count in parse_task(quest.get("task", "")):
+            if section in KILL_SECTIONS:
+                _, _, mob_name, info = next(kills)
+                sources = [mob_name] if info is not None else []
+            elif section == "Collect":
+                sources = loot_index.get(name.lower(), [])
+            else:
+                continue
+            zones = {mobs_data[m].get("Location", "").strip() for m in sources} - {""}
+            for zone in zones:
+                zone_objectives.setdefault(zone, set()).add((idx, len(objectives)))
+            objectives.append((section, name, count, zones))
+        if objectives:
+            quest_objectives[idx] = objectives
+    return quest_objectives, zone_objectives
+
+def plan_route(char_level, quests_data, quest_objectives, zone_objectives):
+    """
+    Greedily order zones so the most eligible quests are finished in the fewest zone changes.
+
+    Each step visits the zone that completes the most remaining quests, breaking ties on
+    partial progress (fraction of each quest's located objectives it satisfies).
+
+    Returns:
+        tuple: (route, unroutable) where route is a list of (zone, completed_quest_indices,
+        objectives) and unroutable lists quest indices whose objectives can't be located.
+    """
+    eligible = [
+        idx for idx in quest_objectives
+        if quest_level(quests_data[idx]) is not None and quest_level(quests_data[idx]) <= char_level
+    ]
+    pending = {}
+    unroutable = []
+    for idx in eligible:
+        located = {i for i, obj in enumerate(quest_objectives[idx]) if obj[3]}
+        if located:
+            pending[idx] = located
+        else:
+            unroutable.append(idx)
+
+    route = []
+    while pending:
+        best_zone, best_score, best_hits = None, (0, 0.0), None
+        for zone, hits in zone_objectives.items():
+            hits = [(q, i) for q, i in hits if q in pending and i in pending[q]]
+            if not hits:
+                continue
+            done = {}
+            for q, i in hits:
+                done[q] = done.get(q, 0) + 1
+            completed = sum(1 for q, n in done.items() if n == len(pending[q]))
+            progress = sum(n / len(quest_objectives[q]) for q, n in done.items())
+            if (completed, progress) > best_score:
+                best_zone, best_score, best_hits = zone, (completed, progress), hits
+        if best_zone is None:
+            break
+        finished = []
+        for q, i in best_hits:
+            pending[q].discard(i)
+        for q in [q for q in pending if not pending[q]]:
+            del pending[q]
+            finished.append(q)
+        objectives = [(q, quest_objectives[q][i]) for q, i in sorted(best_hits)]
+        route.append((best_zone, sorted(finished), objectives))
+    return route, unroutable
+
+def format_route(char_level, route, unroutable, quests_data):
+    """Format a planned route for the quest results box."""
+    if not route:
+        return f"No routable quests for level {char_level}.\n"
+    lines = [f"Route for level {char_level} ({len(route)} zones):", ""]
+    for step, (zone, finished, objectives) in enumerate(route, 1):
+        lines.append(f"{step}. {zone}")
+        for q, (section, name, count, _) in objectives:
+            lines.append(f"     [{quests_data[q].get('quest_#', '?')}] {section} {count}x {name}")
+        if finished:
+            ids = ", ".join(quests_data[q].get("quest_#", "?") for q in finished)
+            lines.append(f"   -> completes: {ids}")
+    if unroutable:
+        ids = ", ".join(quests_data[q].get("quest_#", "?") for q in unroutable)
+        lines.append("")
+        lines.append(f"No known location for objectives of: {ids}")
+    return "\n".join(lines) + "\n"
+
+# --- Full-Text Index ---
+def tokenize(text):
+    """Lowercase word tokens, splitting camel-case run-ons like 'SpiritCollect'."""
+    return [token.lower() for token in TOKEN_RE.findall(text or "")]
+
+def build_search_index(quests_data):
+    """
+    Build an inverted index over quest name, giver, task and reward.
+
+    Postings (quest index -> weighted term frequency) and each term's IDF are computed
+    once here; rank_quests only reads them.
+    """
+    postings = {}
+    doc_lengths = []
+    for idx, quest in enumerate(quests_data):
+        length = 0
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for token in tokenize(quest.get(field, "")):
+                doc = postings.setdefault(token, {})
+                doc[idx] = doc.get(idx, 0) + weight
+                length += weight
+        doc_lengths.append(length)
+    total = len(doc_lengths)
+    avg_length = (sum(doc_lengths) / total) if total else 0.0
+    idf = {
+        term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+        for term, docs in postings.items()
+    }
+    return {"postings": postings, "idf": idf, "doc_lengths": doc_lengths, "avg_length": avg_length, "cache": {}}
+
+def rank_quests(query, search_index):
+    """Return (quest index, score) pairs for query, best BM25 score first."""
+    terms = tuple(dict.fromkeys(tokenize(query)))
+    cache = search_index["cache"]
+    if terms in cache:
+        return cache[terms]
+    scores = {}
+    doc_lengths = search_index["doc_lengths"]
+    avg_length = search_index["avg_length"] or 1.0
+    for term in terms:
+        docs = search_index["postings"].get(term)
+        if not docs:
+            continue
+        idf = search_index["idf"][term]
+        for idx, tf in docs.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[idx] / avg_length)
+            scores[idx] = scores.get(idx, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+    ranked = sorted(scores.items(), key=lambda item: -item[1])
+    if len(cache) >= SEARCH_CACHE_SIZE:
+        cache.clear()
+    cache[terms] = ranked
+    return ranked
+
+# --- Quest Tab State ---
+def build_quest_state(quests_data, mobs_data):
+    """Build every precomputed table the Quest tab uses from quests and mobs data."""
+    state = {"quests": quests_data, "mobs": mobs_data}
+    state["join"], state["unresolved"] = build_quest_mob_join(quests_data, mobs_data)
+    state["chains"] = build_chain_graph(quests_data)
+    state["search_index"] = build_search_index(quests_data)
+    state["objectives"], state["zones"] = build_zone_tables(quests_data, state["join"], mobs_data)
+    return state
+
+# --- Search Function ---
+def filter_quests(qid, qtype, region, level_range, only_repeatable, quests_data, text="", search_index=None):
+    """Return the (index, quest) pairs matching the criteria, ranked by relevance when text is given."""
     qid = qid.lower().strip()
     qtype = qtype.lower().strip()
     region = region.lower().strip()
     min_level, max_level = parse_level_range(level_range.strip())
 
+    if text.strip() and search_index is not None:
+        candidates = [(idx, quests_data[idx]) for idx, _ in rank_quests(text, search_index)]
+    else:
+        candidates = enumerate(quests_data)
+
     results = []
-    for quest in quests_data:
+    for idx, quest in candidates:
         quest_level = quest.get("lvl", "").strip()
         quest_level = int(quest_level) if quest_level.isdigit() else None
 
         if (not qid or qid in quest.get("quest_#", "").lower()) and \
            (not qtype or qtype in quest.get("quest_name", "").lower()) and \
            (not region or region == quest.get("giver", "").lower()) and \
-           (not level_range or (quest_level is not None and min_level <= quest_level <= max_level)) and \
+           (not level_range or (quest_level is not None and min_level is not None and min_level <= quest_level <= max_level)) and \
            (not only_repeatable or quest.get("repeatable", "").lower() == "yes"):
-            results.append(quest)
+            results.append((idx, quest))
+    return results
+
+@perf.timed("search.quests")
+def search_quests(qid, qtype, region, level_range, only_repeatable, quest_results, quests_data, quest_mob_join=None,
+                  chain_graph=None, text="", search_index=None):
+    """Search for quests based on the given criteria, ranked by relevance when text is given."""
+    quest_results.config(state=tk.NORMAL)
+    quest_results.delete("1.0", tk.END)
+
+    results = filter_quests(qid, qtype, region, level_range, only_repeatable, quests_data, text, search_index)
 
     if results:
-        for quest in results:
+        for idx, quest in results:
             quest_results.insert(tk.END, f"Quest ID: {quest['quest_#']}\n")
             for key in ['quest_name', 'lvl', 'giver', 'task', 'chain', 'repeatable', 'reward']:
                 value = quest.get(key, 'Unknown')
                 quest_results.insert(tk.END, f"  {key}: {value}\n")
+            if chain_graph:
+                chain_id = normalize_quest_id(quest.get("quest_#", ""))
+                for label, key in (("requires", "prereqs"), ("unlocks", "unlocks")):
+                    chained = chain_graph[key].get(chain_id)
+                    if chained:
+                        quest_results.insert(tk.END, f"  {label}: {' -> '.join(chained)}\n")
+            targets = quest_mob_join[idx] if quest_mob_join else []
+            if targets:
+                quest_results.insert(tk.END, "  hunting:\n")
+                for target, count, mob_name, info in targets:
+                    if info is None:
+                        quest_results.insert(tk.END, f"    {count}x {target}: not in bestiary\n")
+                        continue
+                    has_map = "yes" if info.get("Map") else "no"
+                    quest_results.insert(
+                        tk.END,
+                        f"    {count}x {mob_name.strip()}: Lvl {info.get('Level', '?')}, "
+                        f"{info.get('Location', 'Unknown')} (map: {has_map})\n"
+                    )
             quest_results.insert(tk.END, "\n")
     else:
         quest_results.insert(tk.END, "No matching quests found.")
@@ -82,14 +482,13 @@ def create_quest_tab(parent):
     """Creates the Quest tab in the GUI."""
     tab_quest = ttk.Frame(parent, style="Dark.TFrame")
     parent.add(tab_quest, text="🗺️ Quest")
+    build_quest_tab(tab_quest)
 
-    # Load quest data
-    quests_data = load_quests()
+def build_quest_tab(tab_quest):
+    """Builds the Quest tab's widgets inside an existing frame."""
 
-    # Extract unique values for dropdowns
-    all_quest_ids = sorted({quest.get("quest_#", "").strip() for quest in quests_data if quest.get("quest_#")})
-    all_quest_names = sorted({quest.get("quest_name", "").strip() for quest in quests_data if quest.get("quest_name")})
-    all_quest_givers = sorted({quest.get("giver", "").strip() for quest in quests_data if quest.get("giver")})
+    # Quest and mob data (plus the bestiary join and indexes) arrive from the background loader
+    quest_state = build_quest_state([], {})
 
     # Apply styling
     style = ttk.Style()
@@ -104,23 +503,36 @@ def create_quest_tab(parent):
     # Quest ID Dropdown
     tk.Label(form, text="Quest ID:", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
     qid_var = tk.StringVar()
-    ttk.Combobox(form, textvariable=qid_var, values=[""] + all_quest_ids).pack(fill="x", pady=(0, 5))
+    qid_combo = ttk.Combobox(form, textvariable=qid_var, values=[""])
+    qid_combo.pack(fill="x", pady=(0, 5))
 
     # Quest Name Dropdown
     tk.Label(form, text="Quest Name:", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
     qtype_var = tk.StringVar()
-    ttk.Combobox(form, textvariable=qtype_var, values=[""] + all_quest_names).pack(fill="x", pady=(0, 5))
+    qtype_combo = ttk.Combobox(form, textvariable=qtype_var, values=[""])
+    qtype_combo.pack(fill="x", pady=(0, 5))
 
     # Quest Giver Dropdown
     tk.Label(form, text="Giver:", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
     region_var = tk.StringVar()
-    ttk.Combobox(form, textvariable=region_var, values=[""] + all_quest_givers).pack(fill="x", pady=(0, 5))
+    region_combo = ttk.Combobox(form, textvariable=region_var, values=[""])
+    region_combo.pack(fill="x", pady=(0, 5))
+
+    # Free-Text Search Input
+    tk.Label(form, text="Text Search (name, giver, task, reward):", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
+    text_entry = tk.Entry(form, font=("Lucida Console", 12), bg="#000000", fg="#00FF00", insertbackground="#00FF00")
+    text_entry.pack(fill="x", pady=(0, 5))
 
     # Level Range Input
     tk.Label(form, text="Level Range (e.g., 1-13):", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
     level_range_entry = tk.Entry(form, font=("Lucida Console", 12), bg="#000000", fg="#00FF00", insertbackground="#00FF00")
     level_range_entry.pack(fill="x", pady=(0, 5))
 
+    # Character Level Input (route planner)
+    tk.Label(form, text="Character Level (route planner):", font=("Lucida Console", 12), fg="#00FF00", bg="#000000").pack(anchor="w")
+    char_level_entry = tk.Entry(form, font=("Lucida Console", 12), bg="#000000", fg="#00FF00", insertbackground="#00FF00")
+    char_level_entry.pack(fill="x", pady=(0, 5))
+
     # Checkbox for Repeatable Quests
     only_repeatable_var = tk.BooleanVar(value=False)
     tk.Checkbutton(
@@ -145,7 +557,8 @@ def create_quest_tab(parent):
         command=lambda: search_quests(
             qid_var.get(), qtype_var.get(), region_var.get(),
             level_range_entry.get(), only_repeatable_var.get(),
-            quest_results, quests_data
+            quest_results, quest_state["quests"], quest_state["join"], quest_state["chains"],
+            text_entry.get(), quest_state["search_index"]
         )
     )
     search_button.pack(side="left", expand=True, fill="x", padx=5)
@@ -158,7 +571,9 @@ def create_quest_tab(parent):
             qid_var.set(""),
             qtype_var.set(""),
             region_var.set(""),
+            text_entry.delete(0, tk.END),
             level_range_entry.delete(0, tk.END),
+            char_level_entry.delete(0, tk.END),
             only_repeatable_var.set(False),
             quest_results.config(state=tk.NORMAL),
             quest_results.delete("1.0", tk.END),
@@ -166,3 +581,81 @@ def create_quest_tab(parent):
         ]
     )
     clear_button.pack(side="left", expand=True, fill="x", padx=5)
+
+    # Fill the dropdowns from the current quest data
+    def refresh_dropdowns():
+        quests = quest_state["quests"]
+        qid_combo.config(values=[""] + sorted({q.get("quest_#", "").strip() for q in quests if q.get("quest_#")}))
+        qtype_combo.config(values=[""] + sorted({q.get("quest_name", "").strip() for q in quests if q.get("quest_name")}))
+        region_combo.config(values=[""] + sorted({q.get("giver", "").strip() for q in quests if q.get("giver")}))
+
+    def show_message(message):
+        quest_results.config(state=tk.NORMAL)
+        quest_results.delete("1.0", tk.END)
+        quest_results.insert(tk.END, message)
+        quest_results.config(state=tk.DISABLED)
+
+    def on_loaded(state):
+        quest_state.update(state)
+        refresh_dropdowns()
+        show_message("")
+
+    # Reload Button: re-read quests/mobs and rebuild the kill-target join
+    def reload_data():
+        def reloaded(state):
+            quest_state.update(state)
+            refresh_dropdowns()
+            show_unresolved()
+
+        show_message("Reloading...\n")
+        # Read through the raising loaders so a missing or corrupt file keeps the current data
+        def read_data():
+            return build_quest_state(dataloader.read_quests(), dataloader.read_mobs())
+
+        tasks.run_task(tab_quest, "io", read_data, on_done=reloaded,
+                       on_error=lambda e: show_message(f"Reload failed: {e}\n"))
+
+    # Report kill targets that don't match any bestiary entry, and broken quest chains
+    def show_unresolved():
+        quest_results.config(state=tk.NORMAL)
+        quest_results.delete("1.0", tk.END)
+        quest_results.insert(tk.END, format_unresolved_targets(quest_state["unresolved"]))
+        quest_results.insert(tk.END, "\n" + format_chain_issues(quest_state["chains"]))
+        quest_results.config(state=tk.DISABLED)
+
+    reload_button = tk.Button(
+        button_frame, text="🔄 Reload", bg="#555555", fg="#00FF00",
+        font=("Lucida Console", 10), command=reload_data
+    )
+    reload_button.pack(side="left", expand=True, fill="x", padx=5)
+
+    unresolved_button = tk.Button(
+        button_frame, text="⚠️ Data Issues", bg="#555555", fg="#00FF00",
+        font=("Lucida Console", 10), command=show_unresolved
+    )
+    unresolved_button.pack(side="left", expand=True, fill="x", padx=5)
+
+    # Route Button: plan a zone route for the given character level
+    def show_route():
+        level = char_level_entry.get().strip()
+        if not level.isdigit():
+            messagebox.showerror("Invalid Level", "Please enter a character level (e.g., 18).")
+            return
+        route, unroutable = plan_route(int(level), quest_state["quests"], quest_state["objectives"], quest_state["zones"])
+        quest_results.config(state=tk.NORMAL)
+        quest_results.delete("1.0", tk.END)
+        quest_results.insert(tk.END, format_route(int(level), route, unroutable, quest_state["quests"]))
+        quest_results.config(state=tk.DISABLED)
+
+    route_button = tk.Button(
+        button_frame, text="🧭 Plan Route", bg="#00FF00", fg="#000000",
+        font=("Lucida Console", 10), command=show_route
+    )
+    route_button.pack(side="left", expand=True, fill="x", padx=5)
+
+    # Fill in once the background loader has the quest data
+    show_message("Loading quest data...\n")
+    dataloader.when_loaded(
+        tab_quest, "quests", on_loaded,
+        lambda e: show_message(f"Error loading quest data: {e}\nFile expected at:\n{QUESTS_JSON_PATH}\n")
+    )
@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import random
+
+# --- Synthetic Dataset Generator ---
+# Writes mobs.json, quests.json, recipe files, an inventory paste and a fake Detect-tab
+# control tree shaped like the real data, at a multiple of its current size. Used by bench.py;
+# also runnable on its own, e.g. "python synthdata.py --scale 100 --out synth".
+
+# Sizes at scale 1, roughly matching the shipped data
+BASE_COUNTS = {
+    "mobs": 334,
+    "zones": 47,
+    "quests": 76,
+    "quest_categories": 31,
+    "recipes_per_file": 60,
+    "materials": 150,
+    "inventory_lines": 200,
+    "controls": 60,
+}
+RECIPE_FILES = ("alchemy.txt", "armor.txt", "weapons.txt", "jewel.txt")
+TIER_COUNT = 6
+
+MOB_TYPES = ["Humanoid", "Animal", "Undead", "Aquatic", "Reptile", "Elemental", "Insect", ""]
+DIVINITIES = ["Night", "Earth", "Lightning", "Fire", "Water", "Ice", ""]
+SYLLABLES = ["gor", "ak", "ith", "mar", "ul", "zen", "dra", "kel", "vor", "shi", "om", "rax", "bel", "tor", "quin"]
+MOB_NOUNS = ["Guard", "Looter", "Spider", "Wolf", "Wraith", "Slime", "Golem", "Serpent", "Beetle", "Crab", "Shaman"]
+ITEM_NOUNS = ["Hide", "Scale", "Dust", "Ore", "Fang", "Silk", "Resin", "Bone", "Shard", "Root", "Feather"]
+RECIPE_NOUNS = ["Helm", "Potion", "Blade", "Ring", "Boots", "Elixir", "Bow", "Amulet", "Gloves", "Staff"]
+UI_LABELS = ["HP: 120/120", "Gold: 5400", "Ready", "Exp: 55%", "Level: 32", "STR", "AGI", "Quests", "Pine Apple"]
+
+
+def scaled(name, scale):
+    return max(1, int(BASE_COUNTS[name] * scale))
+
+def make_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+def letter_suffix(number):
+    """Spreadsheet-style suffix (A, B, ..., AA): names with digits are dropped by the Detect filter."""
+    suffix = ""
+    number += 1
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        suffix = chr(ord("A") + remainder) + suffix
+    return suffix
+
+def unique_names(rng, count, build):
+    """count distinct names from build(rng), suffixing repeats once the vocabulary runs out."""
+    names = []
+    seen = set()
+    while len(names) < count:
+        name = build(rng)
+        if name in seen:
+            name = f"{name} {letter_suffix(len(names))}"
+        if name in seen:
+            continue
+        seen.add(name)
+        names.append(name)
+    return names
+
+# --- Generators ---
+def generate_materials(rng, scale):
+    return unique_names(rng, scaled("materials", scale), lambda r: f"{make_word(r)} {r.choice(ITEM_NOUNS)}")
+
+def generate_mobs(rng, scale, materials):
+    """mobs.json dict, header row first, with loot drawn from the recipe materials."""
+    zones = unique_names(rng, scaled("zones", scale), lambda r: f"{make_word(r)} {r.choice(['Forest', 'Isle', 'Mines', 'Vale', 'Camp'])}")
+    names = unique_names(rng, scaled("mobs", scale), lambda r: f"{make_word(r)} {r.choice(MOB_NOUNS)}")
+    mobs = {"Name": {"Level": "Lvl", "Type": "Type", "Divinity": "Divinity", "Capturable": "Pet",
+                     "Location": "Area", "Loot Drops": ["Equipment Drops"]}}
+    for name in names:
+        mobs[name] = {
+            "Level": str(rng.randint(1, 100)),
+            "Type": rng.choice(MOB_TYPES),
+            "Divinity": rng.choice(DIVINITIES),
+            "Capturable": rng.choice(["Yes", "No"]),
+            "Location": rng.choice(zones),
+            "Loot Drops": rng.sample(materials, rng.randint(1, 4)) if rng.random() < 0.7 else None,
+            "Map": f"https://example.invalid/maps/{rng.randint(1, 500)}.png" if rng.random() < 0.5 else "",
+        }
+    return mobs
+
+def generate_quests(rng, scale, mob_names, materials):
+    """quests.json dict of categories, with Kill/Collect tasks naming real mobs and items."""
+    categories = [f"{make_word(rng)} Quests" for _ in range(scaled("quest_categories", min(scale, 10)))]
+    quests = {category: [] for category in categories}
+    total = scaled("quests", scale)
+    for number in range(1, total + 1):
+        kills = ", ".join(f"{rng.randint(1, 10)} {rng.choice(mob_names)}" for _ in range(rng.randint(1, 3)))
+        collects = ", ".join(f"{rng.randint(1, 5)} {rng.choice(materials)}" for _ in range(rng.randint(0, 2)))
+        # "chain" lists follow-up quests; pointing only forward keeps the chain graph acyclic
+        chain = str(rng.randint(number + 1, total)) if number < total and rng.random() < 0.3 else "None"
+        quests[rng.choice(categories)].append({
+            "quest_#": str(number),
+            "quest_name": f"{rng.choice(['Helping', 'Hunting', 'Finding', 'Saving'])} the {make_word(rng)}",
+            "lvl": str(rng.randint(1, 100)),
+            "giver": f"{make_word(rng)} {rng.choice(['Elder', 'Guard', 'Widow', 'Merchant'])}",
+            "task": f"Kill: {kills}" + (f"Collect: {collects}" if collects else ""),
+            "chain": chain,
+            "repeatable": rng.choice(["Yes", "No"]),
+            "reward": f"Exp: {rng.randint(1, 500)}kGold:{rng.randint(100, 50000)}",
+        })
+    return quests
+
+def generate_recipe_file(rng, scale, materials, file_name):
+    """Recipe file text: tier header lines, then "Name Tier N, Item (qty), ..." lines."""
+    lines = [f"# synthetic {file_name}"]
+    for tier in range(1, TIER_COUNT + 1):
+        lines.append(f"Tier {tier} , Level {tier * 10 - 9}, Green , Level {tier * 20}")
+    prefix = file_name.split(".")[0].capitalize()
+    for number in range(scaled("recipes_per_file", scale)):
+        ingredients = rng.sample(materials, rng.randint(2, 5))
+        if rng.random() < 0.2:
+            ingredients.append("Violent Essence")
+        parts = ", ".join(f"{item} ({rng.randint(1, 5)})" for item in ingredients)
+        lines.append(f"{prefix} {rng.choice(RECIPE_NOUNS)} {number} Tier {rng.randint(1, TIER_COUNT)}, {parts}")
+    return "\n".join(lines) + "\n"
+
+def generate_inventory(rng, scale, materials):
+    """Inventory paste in the game's "[slot] Item (qty)" format, with a few junk lines."""
+    lines = []
+    for slot in range(1, scaled("inventory_lines", scale) + 1):
+        if rng.random() < 0.01:
+            lines.append(f"[{slot}] Broken line (x{rng.randint(1, 9)}")
+        else:
+            lines.append(f"[{slot}] {rng.choice(materials)} ({rng.randint(1, 300)})")
+    return "\n".join(lines) + "\n"
+
+def generate_controls(rng, scale, mob_names):
+    """Fake STATIC controls as seen by the Detect tab: a few monsters among UI labels and numbers."""
+    controls = []
+    for control_id in range(scaled("controls", scale)):
+        roll = rng.random()
+        if roll < 0.15:
+            text = rng.choice(mob_names)
+        elif roll < 0.6:
+            text = rng.choice(UI_LABELS)
+        elif roll < 0.8:
+            text = str(rng.randint(0, 99999))
+        else:
+            text = make_word(rng)
+        controls.append({"class_name": "STATIC", "control_id": 1000 + control_id,
+                         "visible": rng.random() < 0.9, "text": text})
+    return controls
+
+def generate_dataset(out_dir, scale=1, seed=1):
+    """Write a full synthetic dataset under out_dir and return the paths written."""
+    rng = random.Random(seed)
+    materials = generate_materials(rng, scale)
+    mobs = generate_mobs(rng, scale, materials)
+    mob_names = [name for name in mobs if name != "Name"]
+    json_dir = os.path.join(out_dir, "json")
+    os.makedirs(json_dir, exist_ok=True)
+
+    files = {
+        os.path.join(json_dir, "mobs.json"): json.dumps(mobs, indent=1),
+        os.path.join(json_dir, "quests.json"): json.dumps(generate_quests(rng, scale, mob_names, materials), indent=1),
+        os.path.join(out_dir, "inventory.txt"): generate_inventory(rng, scale, materials),
+        os.path.join(out_dir, "controls.json"): json.dumps(generate_controls(rng, scale, mob_names)),
+    }
+    for file_name in RECIPE_FILES:
+        files[os.path.join(json_dir, file_name)] = generate_recipe_file(rng, scale, materials, file_name)
+    for path, content in files.items():
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    return sorted(files)
+
+# --- Main Function ---
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Autobeast dataset.")
+    parser.add_argument("--scale", type=float, default=1, help="multiple of the current data size (1-1000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="synth", help="output directory")
+    args = parser.parse_args()
+    for path in generate_dataset(args.out, args.scale, args.seed):
+        print(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Shared Background Executor ---
+# One app-wide set of named pools. Slow work runs on a pool; results come back to the tk
+# main loop through a queue drained by a single after() pump, so callbacks can touch widgets.
+#   "io"  - file, network and waiting-on-other-work tasks
+#   "cpu" - computation; a single worker, so tasks sharing module caches never overlap
+POOL_SIZES = {
+    "io": min(8, (os.cpu_count() or 1) + 4),
+    "cpu": 1,
+}
+MAX_PENDING = 64  # Back-pressure: submissions beyond this many unfinished tasks per pool are refused
+PUMP_MS = 30
+
+pools = {}
+pending_counts = {}
+keyed_tasks = {}
+callback_queue = queue.Queue()
+pool_lock = threading.Lock()
+pump_state = {"root": None}
+
+
+class PoolBusyError(RuntimeError):
+    """A task was refused because its pool already has MAX_PENDING unfinished tasks."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag handed to a task; long-running work should check it."""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds; returns True early if cancelled."""
+        return self.event.wait(timeout)
+
+
+# --- Pools ---
+def get_pool(name):
+    """Return the named pool, creating it on first use."""
+    with pool_lock:
+        if name not in pools:
+            pools[name] = ThreadPoolExecutor(max_workers=POOL_SIZES[name], thread_name_prefix=f"tasks-{name}")
+            pending_counts[name] = 0
+        return pools[name]
+
+def shutdown():
+    """Cancel keyed tasks and stop every pool without waiting for running work."""
+    for token, future in list(keyed_tasks.values()):
+        token.cancel()
+        future.cancel()
+    keyed_tasks.clear()
+    with pool_lock:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        pools.clear()
+
+
+# --- Main-Loop Callbacks ---
+def install(root):
+    """Start draining task callbacks on root's event loop (safe to call more than once)."""
+    if pump_state["root"] is not None:
+        return
+
+    def pump():
+        while True:
+            try:
+                widget, callback, args = callback_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if widget is None or widget.winfo_exists():
+                    callback(*args)
+            except Exception as e:
+                print(f"Error in task callback: {e}")
+        root.after(PUMP_MS, pump)
+
+    pump_state["root"] = root
+    root.after(PUMP_MS, pump)
+
+def call_soon(widget, callback, *args):
+    """Run callback(*args) on the tk main loop; safe to call from any thread."""
+    callback_queue.put((widget, callback, args))
+
+def call_when_done(widget, future, on_done, on_error=None):
+    """Deliver a future's result (or exception) to on_done/on_error on the tk main loop."""
+    if pump_state["root"] is None and widget is not None:
+        install(widget.winfo_toplevel())
+
+    def done(f):
+        if f.cancelled():
+            return
+        error = f.exception()
+        if error is None:
+            call_soon(widget, on_done, f.result())
+        elif on_error is not None:
+            call_soon(widget, on_error, error)
+        else:
+            print(f"Error in background task: {error}")
+
+    future.add_done_callback(done)
+
+
+# --- Submitting Work ---
+def submit(pool_name, func, *args, key=None, token=None):
+    """
+    Run func(*args) on the named pool and return its future, or None when the pool is full.
+
+    With a key, a newer submission supersedes the previous one with the same key: the old
+    task's token is cancelled and, if it hasn't started, it never runs. Pass a token to let
+    func observe cancellation (func then receives it as a "token" keyword argument).
+    """
+    pool = get_pool(pool_name)
+    with pool_lock:
+        if pending_counts[pool_name] >= MAX_PENDING:
+            return None
+        pending_counts[pool_name] += 1
+
+    if key is not None:
+        previous = keyed_tasks.pop(key, None)
+        if previous is not None:
+            previous[0].cancel()
+            previous[1].cancel()
+        token = token or CancelToken()
+
+    if token is not None:
+        future = pool.submit(func, *args, token=token)
+    else:
+        future = pool.submit(func, *args)
+
+    def finished(f):
+        with pool_lock:
+            pending_counts[pool_name] -= 1
+        if key is not None and keyed_tasks.get(key, (None, None))[1] is f:
+            keyed_tasks.pop(key, None)
+
+    if key is not None:
+        keyed_tasks[key] = (token, future)
+    future.add_done_callback(finished)
+    return future
+
+def run_task(widget, pool_name, func, *args, on_done=None, on_error=None, key=None, token=None):
+    """
+    submit() plus delivery of the result to on_done/on_error on the tk main loop.
+
+    A task refused by back-pressure is reported to on_error as a PoolBusyError, so the
+    caller's UI doesn't wait for a result that never comes.
+    """
+    future = submit(pool_name, func, *args, key=key, token=token)
+    if future is None:
+        if on_error is not None:
+            if pump_state["root"] is None and widget is not None:
+                install(widget.winfo_toplevel())
+            call_soon(widget, on_error, PoolBusyError(f"busy with other work ({pool_name}), try again"))
+    elif on_done is not None or on_error is not None:
+        call_when_done(widget, future, on_done or (lambda result: None), on_error)
+    return future
@@ -0,0 +1,36 @@
+import time
+
+import abdetect
+import tasks
+
+
+class BrokenWindow:
+    """A game window whose controls can't be listed (e.g. the game is mid-restart)."""
+
+    def is_minimized(self):
+        return False
+
+    def children(self):
+        raise RuntimeError("control vanished")
+
+
+def test_persistent_scan_error_waits_before_reattaching(monkeypatch):
+    monkeypatch.setattr(abdetect, "REATTACH_INTERVAL", 0.1)
+    calls = []
+
+    def find_window():
+        calls.append(time.perf_counter())
+        return BrokenWindow()
+
+    statuses = []
+    detector = abdetect.create_detector({}, lambda monsters: None, statuses.append, find_window)
+    abdetect.set_observed(detector, "test", True)
+    assert abdetect.start_detector(detector)
+    time.sleep(0.5)
+    abdetect.stop_detector(detector)
+    detector["future"].result(timeout=5)
+
+    assert 2 <= len(calls) <= 8
+    assert "Game window lost; waiting for it to return..." in statuses
+    assert statuses[-1] == "Stopped"
+    tasks.shutdown()
@@ -0,0 +1,121 @@
+import http.client
+import json
+
+import pytest
+
+import api
+import crafting
+import dataloader
+import tasks
+
+MOBS = {
+    "Name": {"Level": "Lvl", "Type": "Type", "Divinity": "Divinity", "Capturable": "Pet",
+             "Location": "Area", "Loot Drops": ["Equipment Drops"]},
+    "Gorgon Guard": {"Level": "24", "Type": "Humanoid", "Divinity": "Fire", "Capturable": "No",
+                     "Location": "Abandoned Camp", "Loot Drops": ["Red Slime", "Iron Ore"]},
+    "Forest Wolf": {"Level": "8", "Type": "Animal", "Divinity": "Earth", "Capturable": "Yes",
+                    "Location": "Green Woods", "Loot Drops": ["Wolf Hide"]},
+}
+QUESTS = {"Daily Quests": [
+    {"quest_#": "707", "quest_name": "Helping the Widow", "lvl": "15", "giver": "Troubled Widow",
+     "task": "Kill: 4 Forest WolfCollect: 2 Red Slime", "chain": "None", "repeatable": "Yes", "reward": "Exp: 200"},
+    {"quest_#": "708", "quest_name": "Camp Cleanup", "lvl": "25", "giver": "Captain",
+     "task": "Kill: 3 Gorgon Guard", "chain": "None", "repeatable": "No", "reward": "Gold: 50"},
+]}
+RECIPES = "Tier 1 , Level 1, Green , Level 20\nWolf Cloak Tier 1, Wolf Hide (2), Violent Essence (1)\n"
+
+
+@pytest.fixture
+def api_server(tmp_path, monkeypatch):
+    (tmp_path / "json").mkdir()
+    (tmp_path / "json" / "mobs.json").write_text(json.dumps(MOBS), encoding="utf-8")
+    (tmp_path / "json" / "quests.json").write_text(json.dumps(QUESTS), encoding="utf-8")
+    (tmp_path / "json" / "alchemy.txt").write_text(RECIPES, encoding="utf-8")
+    monkeypatch.setattr(dataloader, "MOBS_JSON_PATH", str(tmp_path / "json" / "mobs.json"))
+    monkeypatch.setattr(dataloader, "QUESTS_JSON_PATH", str(tmp_path / "json" / "quests.json"))
+    monkeypatch.setattr(crafting, "LOCAL_JSON_DIR", str(tmp_path / "json"))
+    monkeypatch.setattr(dataloader, "futures", {})
+    monkeypatch.setattr(dataloader, "SYNC_ENABLED", False)
+    monkeypatch.setattr(crafting, "selected_files", {"alchemy.txt": True})
+    crafting.parsed_file_cache.clear()
+    api.response_cache.clear()
+    api.craft_cache.clear()
+
+    api.start_in_background(port=0)
+    port = api.server_state["server"].sockets[0].getsockname()[1]
+    for future in dataloader.futures.values():
+        future.result(timeout=10)
+    yield port
+    api.stop()
+    tasks.shutdown()
+    crafting.parsed_file_cache.clear()
+
+
+def call(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_health(api_server):
+    status, payload = call(api_server, "GET", "/health")
+    assert status == 200
+    assert payload["datasets"] == {"mobs": True, "quests": True, "recipes": True}
+
+
+def test_mobs_filters_and_limit(api_server):
+    status, payload = call(api_server, "GET", "/mobs?level=1-10")
+    assert status == 200
+    assert [mob["name"] for mob in payload["mobs"]] == ["Forest Wolf"]
+    status, payload = call(api_server, "GET", "/mobs?limit=1")
+    assert payload["count"] == 2 and len(payload["mobs"]) == 1
+
+
+def test_mob_by_name(api_server):
+    status, payload = call(api_server, "GET", "/mobs/forest%20wolf")
+    assert status == 200
+    assert payload["name"] == "Forest Wolf" and payload["Location"] == "Green Woods"
+
+
+def test_loot(api_server):
+    status, payload = call(api_server, "GET", "/loot?item=red%20slime")
+    assert status == 200
+    assert [mob["name"] for mob in payload["mobs"]] == ["Gorgon Guard"]
+
+
+def test_quests_with_hunting_join(api_server):
+    status, payload = call(api_server, "GET", "/quests?id=707")
+    assert status == 200
+    assert payload["count"] == 1
+    hunting = payload["quests"][0]["hunting"]
+    assert hunting[0]["mob"] == "Forest Wolf" and hunting[0]["location"] == "Green Woods"
+
+
+def test_craft(api_server):
+    status, payload = call(api_server, "POST", "/craft", body="[1] Wolf Hide (5)\n[2] Iron Ore (x)".encode("utf-8"))
+    assert status == 200
+    assert payload["craftable"]["Wolf Cloak Tier 1"]["quantity"] == 2
+    assert [line["line"] for line in payload["skipped_lines"]] == [2]
+
+
+def test_error_cases(api_server):
+    assert call(api_server, "GET", "/mobs/Nobody")[0] == 404
+    assert call(api_server, "GET", "/nowhere")[0] == 404
+    assert call(api_server, "POST", "/mobs")[0] == 405
+    assert call(api_server, "GET", "/craft")[0] == 405
+    assert call(api_server, "GET", "/mobs?level=high")[0] == 400
+    assert call(api_server, "GET", "/loot")[0] == 400
+    assert call(api_server, "GET", "/mobs?limit=many")[0] == 400
+
+
+def test_concurrent_requests(api_server):
+    from concurrent.futures import ThreadPoolExecutor
+
+    paths = ["/mobs?name=gor", "/loot?item=wolf%20hide", "/quests?text=widow", "/mobs/Gorgon%20Guard"] * 50
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        statuses = list(pool.map(lambda path: call(api_server, "GET", path)[0], paths))
+    assert statuses == [200] * len(paths)
@@ -0,0 +1,89 @@
+import crafting
+
+
+def test_multilevel_count_unbounded_when_intermediates_use_only_excluded_materials():
+    all_recipes = {"A Tier 1": {"B": 1}, "B": {"Violent Essence": 2}}
+    expansions = crafting.build_recipe_expansions(all_recipes)["expansions"]
+    count = crafting.multilevel_count(all_recipes["A Tier 1"], all_recipes, expansions, {})
+    assert count == float("inf")
+
+
+def test_multilevel_count_unbounded_once_stocked_intermediates_run_out():
+    all_recipes = {"A Tier 1": {"B": 1}, "B": {"Violent Essence": 2}}
+    expansions = crafting.build_recipe_expansions(all_recipes)["expansions"]
+    assert crafting.multilevel_count(all_recipes["A Tier 1"], all_recipes, expansions, {"B": 3}) == float("inf")
+
+
+def test_multilevel_count_bounded_by_base_materials():
+    all_recipes = {"A Tier 1": {"B": 2}, "B": {"Ore": 3, "Violent Essence": 1}}
+    expansions = crafting.build_recipe_expansions(all_recipes)["expansions"]
+    inventory = {"B": 1, "Ore": 30}
+    # 1 B in stock plus 10 crafted from ore = 11 B, enough for 5 crafts
+    assert crafting.multilevel_count(all_recipes["A Tier 1"], all_recipes, expansions, inventory) == 5
+
+
+def test_multilevel_report_and_live_entry_handle_unbounded_recipes():
+    all_recipes = {"A Tier 1": {"B": 1}, "B": {"Violent Essence": 2}}
+    recipes = {"A Tier 1": all_recipes["A Tier 1"]}
+    report = crafting.multilevel_crafting_report({}, recipes, all_recipes, {})
+    assert report["A Tier 1"]["quantity"] == float("inf")
+    expansions = crafting.build_recipe_expansions(all_recipes)["expansions"]
+    entry = crafting.recipe_report_entry(recipes["A Tier 1"], all_recipes, expansions, {})
+    assert entry["quantity"] == float("inf")
+
+
+def test_value_objective_prefers_valuable_recipes(tmp_path, monkeypatch):
+    (tmp_path / crafting.RECIPE_VALUES_FILE).write_text(
+        "# recipe, value\nCheap Tier 1, 1\nPricey Tier 1, 50\nBroken Tier 1, lots\n", encoding="utf-8")
+    monkeypatch.setattr(crafting, "LOCAL_JSON_DIR", str(tmp_path))
+    crafting.recipe_values_cache.clear()
+    values = crafting.load_recipe_values()
+    assert values == {"Cheap Tier 1": 1.0, "Pricey Tier 1": 50.0}
+
+    recipes = {"Cheap Tier 1": {"Ore": 1}, "Pricey Tier 1": {"Ore": 5}}
+    inventory = {"Ore": 10}
+    assert crafting.optimize_crafts(recipes, inventory, "count")["Cheap Tier 1"]["quantity"] == 10
+    plan = crafting.optimize_crafts(recipes, inventory, "value", values)
+    assert plan == {"Pricey Tier 1": {"quantity": 2, "recipe": recipes["Pricey Tier 1"]}}
+
+
+def test_missing_values_file_means_no_weights(tmp_path, monkeypatch):
+    monkeypatch.setattr(crafting, "LOCAL_JSON_DIR", str(tmp_path))
+    crafting.recipe_values_cache.clear()
+    assert crafting.load_recipe_values() == {}
+
+
+def test_recipe_names_are_remembered_per_file_selection(tmp_path, monkeypatch):
+    (tmp_path / "alchemy.txt").write_text("Potion Tier 1, Herb (2)\nElixir Tier 2, Herb (3)\n", encoding="utf-8")
+    monkeypatch.setattr(crafting, "LOCAL_JSON_DIR", str(tmp_path))
+    monkeypatch.setattr(crafting, "recipe_choices", {})
+    crafting.parsed_file_cache.clear()
+    files = {"alchemy.txt": True}
+    assert crafting.recipe_names_for(files) == ["Elixir Tier 2", "Potion Tier 1"]
+    assert crafting.recipe_choices["entry"] == (files, ["Elixir Tier 2", "Potion Tier 1"])
+    crafting.parsed_file_cache.clear()
+
+
+def test_run_batch_uses_the_selection_it_was_given(tmp_path, monkeypatch):
+    recipes_dir = tmp_path / "recipes"
+    recipes_dir.mkdir()
+    (recipes_dir / "alchemy.txt").write_text("Potion Tier 1, Herb (2)\n", encoding="utf-8")
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    (dumps / "alt.txt").write_text("Herb (5)\n", encoding="utf-8")
+    monkeypatch.setattr(crafting, "LOCAL_JSON_DIR", str(recipes_dir))
+    # The globals select nothing; only the arguments should count
+    monkeypatch.setattr(crafting, "selected_files", {"alchemy.txt": False})
+    monkeypatch.setattr(crafting, "selected_tiers", {"Tier 1": False})
+    crafting.parsed_file_cache.clear()
+    path = crafting.run_batch(str(dumps), {"alchemy.txt": True}, {"Tier 1": True}, workers=1)
+    crafting.parsed_file_cache.clear()
+    with open(path, encoding="utf-8") as f:
+        assert "Potion Tier 1: Can craft 2" in f.read()
+
+
+def test_optimize_crafts_ignores_materials_missing_from_the_inventory():
+    # "Catalyst" is listed with qty 0 and is not in the inventory at all
+    recipes = {"Potion Tier 1": {"Herb": 2, "Catalyst": 0}, "Salve Tier 1": {"Moss": 1}}
+    plan = crafting.optimize_crafts(recipes, {"Herb": 5}, "count")
+    assert plan == {"Potion Tier 1": {"quantity": 2, "recipe": recipes["Potion Tier 1"]}}
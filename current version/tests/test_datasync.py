@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+
+import pytest
+
+import datadiff
+import datasync
+import httpclient
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def publish(server_dir):
+    manifest_path = os.path.join(server_dir, datasync.MANIFEST_NAME)
+    previous = {}
+    if os.path.exists(manifest_path):
+        previous = {name: entry.get("patches") for name, entry in read_json(manifest_path)["files"].items()}
+    write_json(manifest_path, datasync.build_manifest(server_dir, previous))
+
+
+@pytest.fixture
+def server(tmp_path):
+    server_dir = tmp_path / "server"
+    write_json(str(server_dir / "mobs.json"), {"Gor": {"Level": "5"}, "Rat": {"Level": "1"}})
+    write_json(str(server_dir / "quests.json"), [{"quest_#": "1"}])
+    publish(str(server_dir))
+    http_server = datasync.serve(str(server_dir), 0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield {"dir": str(server_dir), "url": f"http://127.0.0.1:{http_server.server_address[1]}/", "server": http_server}
+    http_server.shutdown()
+    http_server.server_close()
+    httpclient.close_all()
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    """Record (path, status) of every request the sync makes."""
+    seen = []
+    request = httpclient.request
+
+    def recording_request(url, headers=None, method="GET"):
+        response = request(url, headers, method)
+        seen.append((url.rsplit("/", 1)[-1], response[0]))
+        return response
+
+    monkeypatch.setattr(httpclient, "request", recording_request)
+    return seen
+
+
+def test_first_sync_downloads_everything(server, tmp_path):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    assert datasync.sync(server["url"], data_dir) == ["mobs.json", "quests.json"]
+    assert read_json(os.path.join(data_dir, "mobs.json")) == read_json(os.path.join(server["dir"], "mobs.json"))
+    assert not os.path.exists(os.path.join(data_dir, datasync.STAGING_DIR_NAME))
+
+
+def test_unchanged_manifest_costs_one_304(server, tmp_path, statuses):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    datasync.sync(server["url"], data_dir)
+    statuses.clear()
+    assert datasync.sync(server["url"], data_dir) == []
+    assert statuses == [("manifest.json", 304)]
+
+
+def test_reformatted_local_copy_is_not_downloaded(server, tmp_path, statuses):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    with open(os.path.join(server["dir"], "mobs.json"), "r", encoding="utf-8") as f:
+        mobs = json.load(f)
+    with open(os.path.join(data_dir, "mobs.json"), "w", encoding="utf-8") as f:
+        json.dump(mobs, f)  # Same records, different formatting
+    assert datasync.sync(server["url"], data_dir) == ["quests.json"]
+    assert ("mobs.json", 200) not in statuses
+
+
+def test_update_uses_registered_patch(server, tmp_path, statuses):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    datasync.sync(server["url"], data_dir)
+
+    mobs_path = os.path.join(server["dir"], "mobs.json")
+    new_mobs_path = str(tmp_path / "new-mobs.json")
+    write_json(new_mobs_path, {"Gor": {"Level": "6"}, "Bat": {"Level": "2"}})
+    patch = datadiff.build_patch(read_json(mobs_path), read_json(new_mobs_path), "mobs.json")
+    patch_path = os.path.join(server["dir"], "patches", "mobs-1.json")
+    write_json(patch_path, patch)
+    datadiff.register_patch(os.path.join(server["dir"], datasync.MANIFEST_NAME), patch, patch_path)
+    os.replace(new_mobs_path, mobs_path)
+    publish(server["dir"])
+
+    statuses.clear()
+    assert datasync.sync(server["url"], data_dir) == ["mobs.json"]
+    assert read_json(os.path.join(data_dir, "mobs.json")) == {"Gor": {"Level": "6"}, "Bat": {"Level": "2"}}
+    assert ("mobs-1.json", 200) in statuses
+    assert ("mobs.json", 200) not in statuses
+
+
+def test_hash_mismatch_keeps_local_data(server, tmp_path):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    datasync.sync(server["url"], data_dir)
+    before = read_json(os.path.join(data_dir, "mobs.json"))
+
+    # The file changes on the server but the manifest still lists a different hash
+    manifest_path = os.path.join(server["dir"], datasync.MANIFEST_NAME)
+    manifest = read_json(manifest_path)
+    manifest["files"]["mobs.json"]["sha256"] = "0" * 64
+    write_json(manifest_path, manifest)
+
+    assert datasync.sync(server["url"], data_dir) == []
+    assert read_json(os.path.join(data_dir, "mobs.json")) == before
+
+
+def test_offline_keeps_local_data(server, tmp_path):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    datasync.sync(server["url"], data_dir)
+    server["server"].shutdown()
+    server["server"].server_close()
+    httpclient.close_all()
+
+    assert datasync.sync(server["url"], data_dir) == []
+    assert read_json(os.path.join(data_dir, "mobs.json")) == {"Gor": {"Level": "5"}, "Rat": {"Level": "1"}}
+
+
+def test_restore_brings_back_last_good(server, tmp_path):
+    data_dir = str(tmp_path / "client")
+    os.makedirs(data_dir)
+    datasync.sync(server["url"], data_dir)
+    write_json(os.path.join(server["dir"], "mobs.json"), {"Gor": {"Level": "99"}})
+    publish(server["dir"])
+    assert datasync.sync(server["url"], data_dir) == ["mobs.json"]
+
+    assert datasync.restore_last_good(data_dir) == ["mobs.json"]
+    assert read_json(os.path.join(data_dir, "mobs.json")) == {"Gor": {"Level": "5"}, "Rat": {"Level": "1"}}
+    assert datasync.load_state(data_dir)["manifest"] == {}
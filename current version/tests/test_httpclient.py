@@ -0,0 +1,124 @@
+import http.server
+import os
+import threading
+import time
+
+import pytest
+
+import datasync
+import httpclient
+
+
+class MaxAgeHandler(datasync.DataRequestHandler):
+    """Stand-in that also marks every response fresh for a minute."""
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "max-age=60")
+        super().end_headers()
+
+
+def start_server(directory, handler_class=datasync.DataRequestHandler):
+    handler = lambda *args, **kwargs: handler_class(*args, directory=directory, **kwargs)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def site(tmp_path):
+    directory = tmp_path / "site"
+    directory.mkdir()
+    (directory / "map.png").write_bytes(b"map image v1")
+    # Last-Modified in the future: no heuristic freshness, so every get() revalidates
+    future = time.time() + 3600
+    os.utime(directory / "map.png", (future, future))
+    servers = []
+
+    def serve(handler_class=datasync.DataRequestHandler):
+        server = start_server(str(directory), handler_class)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/map.png", server
+
+    yield {"dir": directory, "serve": serve, "cache": str(tmp_path / "cache")}
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    httpclient.close_all()
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    """Record the status of every request get() makes."""
+    seen = []
+    request = httpclient.request
+
+    def recording_request(url, headers=None, method="GET"):
+        response = request(url, headers, method)
+        seen.append(response[0])
+        return response
+
+    monkeypatch.setattr(httpclient, "request", recording_request)
+    return seen
+
+
+def test_stale_entry_is_revalidated_with_304(site, statuses):
+    url, _ = site["serve"]()
+    assert httpclient.get(url, site["cache"]) == b"map image v1"
+    assert httpclient.get(url, site["cache"]) == b"map image v1"
+    assert statuses == [200, 304]
+
+
+def test_max_age_entry_is_used_without_a_request(site, statuses):
+    url, _ = site["serve"](MaxAgeHandler)
+    httpclient.get(url, site["cache"])
+    (site["dir"] / "map.png").write_bytes(b"map image v2")
+    assert httpclient.get(url, site["cache"]) == b"map image v1"
+    assert statuses == [200]
+
+
+def test_old_last_modified_gets_heuristic_freshness(site, statuses):
+    ten_days_ago = time.time() - 10 * 86400
+    os.utime(site["dir"] / "map.png", (ten_days_ago, ten_days_ago))
+    url, _ = site["serve"]()
+    httpclient.get(url, site["cache"])
+    meta, _ = httpclient.read_cache(url, site["cache"])
+    # 10% of ten days, capped at a day
+    assert meta["fresh_until"] - meta["stored_at"] == pytest.approx(httpclient.MAX_HEURISTIC_SECONDS, abs=5)
+    httpclient.get(url, site["cache"])
+    assert statuses == [200]
+
+
+def test_stale_entry_is_served_when_offline(site):
+    url, server = site["serve"]()
+    httpclient.get(url, site["cache"])
+    server.shutdown()
+    server.server_close()
+    httpclient.close_all()
+    assert httpclient.get(url, site["cache"]) == b"map image v1"
+
+
+def test_offline_without_cache_raises(site):
+    url, server = site["serve"]()
+    server.shutdown()
+    server.server_close()
+    with pytest.raises(OSError):
+        httpclient.get(url, site["cache"])
+
+
+def test_corrupted_cache_entry_is_refetched(site, statuses):
+    url, _ = site["serve"]()
+    httpclient.get(url, site["cache"])
+    body_path, meta_path = httpclient.cache_paths(url, site["cache"])
+    with open(meta_path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert httpclient.get(url, site["cache"]) == b"map image v1"
+    assert statuses == [200, 200]
+    meta, body = httpclient.read_cache(url, site["cache"])
+    assert meta["etag"] and body == b"map image v1"
+
+
+def test_missing_file_raises_http_error(site):
+    url, _ = site["serve"]()
+    with pytest.raises(httpclient.HttpError) as error:
+        httpclient.get(url.replace("map.png", "missing.png"), site["cache"])
+    assert error.value.status == 404
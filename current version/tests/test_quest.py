@@ -0,0 +1,26 @@
+import quest
+
+
+def make_quests(chains):
+    return [{"quest_#": qid, "chain": chain} for qid, chain in chains.items()]
+
+
+def test_chain_graph_closures():
+    graph = quest.build_chain_graph(make_quests({"1": "2", "2": "3", "3": "None", "4": "3"}))
+    assert graph["prereqs"]["3"] == ("1", "4", "2")
+    assert graph["unlocks"]["1"] == ("2", "3")
+    assert graph["cycles"] == []
+
+
+def test_chain_graph_cycle_reachable_from_outside():
+    graph = quest.build_chain_graph(make_quests({"1": "2", "2": "3", "3": "2, 4", "4": "None"}))
+    assert graph["cycles"] == ["2", "3"]
+    assert graph["unlocks"]["1"] == ()
+    assert "4" not in graph["prereqs"]
+
+
+def test_chain_graph_broken_reference_and_self_loop():
+    graph = quest.build_chain_graph(make_quests({"0001": "1, 99", "2": "None"}))
+    assert graph["broken"] == [("0001", "99")]
+    assert graph["cycles"] == ["1"]
+    assert graph["prereqs"]["2"] == ()
@@ -0,0 +1,36 @@
+import threading
+
+import tasks
+
+
+def drain_callbacks():
+    delivered = []
+    while not tasks.callback_queue.empty():
+        widget, callback, args = tasks.callback_queue.get_nowait()
+        delivered.append(callback(*args))
+    return delivered
+
+
+def test_refused_task_reports_busy_to_on_error(monkeypatch):
+    monkeypatch.setattr(tasks, "MAX_PENDING", 1)
+    release = threading.Event()
+    errors = []
+    first = tasks.run_task(None, "io", release.wait, on_done=lambda result: None, on_error=errors.append)
+    second = tasks.run_task(None, "io", lambda: None, on_done=lambda result: None, on_error=errors.append)
+    release.set()
+    first.result()
+    drain_callbacks()
+    assert second is None
+    assert len(errors) == 1 and isinstance(errors[0], tasks.PoolBusyError)
+
+
+def test_keyed_submit_supersedes_queued_task():
+    release = threading.Event()
+    ran = []
+    tasks.submit("cpu", release.wait)  # Occupy the single cpu worker
+    first = tasks.submit("cpu", lambda token: ran.append("first"), key="test")
+    second = tasks.submit("cpu", lambda token: ran.append("second"), key="test")
+    release.set()
+    second.result()
+    assert first.cancelled()
+    assert ran == ["second"]
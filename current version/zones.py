@@ -0,0 +1,235 @@
+import tkinter as tk
+from tkinter import ttk
+
+import dataloader
+import tasks
+from bestiary import MOBS_JSON_PATH, open_map_window
+
+# --- Zone Aggregates ---
+def is_mob_entry(info):
+    """True for real mob rows (mobs.json starts with a column-header row)."""
+    return isinstance(info, dict) and info.get("Level") != "Lvl"
+
+def mob_zone(info):
+    """Return the zone (Location) a mob belongs to."""
+    return (info.get("Location") or "Unknown").strip() or "Unknown"
+
+def build_zone_members(mobs_data):
+    """Map each zone to the sorted names of the mobs found there."""
+    members = {}
+    for name, info in mobs_data.items():
+        if is_mob_entry(info):
+            members.setdefault(mob_zone(info), []).append(name)
+    for names in members.values():
+        names.sort(key=str.lower)
+    return members
+
+def summarize_zone(names, mobs_data):
+    """Compute the aggregate stats for one zone from its member mobs."""
+    levels = []
+    divinities = {}
+    types = {}
+    pets = []
+    loot = set()
+    for name in names:
+        info = mobs_data[name]
+        level = str(info.get("Level", "")).strip()
+        if level.isdigit():
+            levels.append(int(level))
+        divinity = (info.get("Divinity") or "Unknown").strip() or "Unknown"
+        divinities[divinity] = divinities.get(divinity, 0) + 1
+        mob_type = (info.get("Type") or "Unknown").strip() or "Unknown"
+        types[mob_type] = types.get(mob_type, 0) + 1
+        if str(info.get("Capturable", "")).strip().lower() == "yes":
+            pets.append(name.strip())
+        for drop in info.get("Loot Drops") or []:
+            loot.update(item.strip() for item in drop.split(",") if item.strip())
+    levels.sort()
+    if levels:
+        mid = len(levels) // 2
+        median = levels[mid] if len(levels) % 2 else (levels[mid - 1] + levels[mid]) / 2
+    else:
+        median = None
+    return {
+        "count": len(names),
+        "level_min": levels[0] if levels else None,
+        "level_max": levels[-1] if levels else None,
+        "level_median": median,
+        "divinity": divinities,
+        "type": types,
+        "pets": pets,
+        "loot": sorted(loot, key=str.lower),
+    }
+
+def build_zone_aggregates(mobs_data):
+    """Compute (members, aggregates) for every zone in one pass over mobs_data."""
+    members = build_zone_members(mobs_data)
+    aggregates = {zone: summarize_zone(names, mobs_data) for zone, names in members.items()}
+    return members, aggregates
+
+def update_zone_aggregates(members, aggregates, old_mobs, new_mobs):
+    """
+    Refresh members/aggregates in place for a reloaded mobs_data.
+
+    Only zones that gained, lost or changed a mob are recomputed.
+
+    Returns:
+        set: The zones that were recomputed.
+    """
+    touched = set()
+    for name in set(old_mobs) | set(new_mobs):
+        old_info = old_mobs.get(name)
+        new_info = new_mobs.get(name)
+        if old_info == new_info:
+            continue
+        if is_mob_entry(old_info):
+            touched.add(mob_zone(old_info))
+        if is_mob_entry(new_info):
+            touched.add(mob_zone(new_info))
+    if not touched:
+        return touched
+
+    for zone in touched:
+        members.pop(zone, None)
+    for name, info in new_mobs.items():
+        if is_mob_entry(info) and mob_zone(info) in touched:
+            members.setdefault(mob_zone(info), []).append(name)
+    for zone in touched:
+        if zone in members:
+            members[zone].sort(key=str.lower)
+            aggregates[zone] = summarize_zone(members[zone], new_mobs)
+        else:
+            aggregates.pop(zone, None)
+    return touched
+
+def format_histogram(histogram):
+    """Format a {value: count} histogram, most common first."""
+    return ", ".join(f"{k} {v}" for k, v in sorted(histogram.items(), key=lambda item: (-item[1], item[0])))
+
+# --- Create Zones Tab ---
+def create_zones_tab(parent):
+    """Creates the Zones tab in the GUI."""
+    tab_zones = ttk.Frame(parent, style="Dark.TFrame")
+    parent.add(tab_zones, text="🌍 Zones")
+    build_zones_tab(tab_zones)
+
+def build_zones_tab(tab_zones):
+    """Builds the Zones tab's widgets inside an existing frame."""
+
+    # Filled in by the background loader, which precomputes the aggregates
+    zone_state = {"mobs": {}, "members": {}, "aggregates": {}}
+
+    main_frame = tk.Frame(tab_zones, bg="#000000")
+    main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+    # Zone list on the left, details on the right
+    list_frame = tk.Frame(main_frame, bg="#000000")
+    list_frame.pack(side="left", fill="y")
+    zone_list = tk.Listbox(list_frame, width=32, font=("Lucida Console", 10), fg="#00FF00", bg="#000000",
+                           selectbackground="#00FF00", selectforeground="#000000", exportselection=False)
+    zone_list.pack(side="top", fill="y", expand=True)
+
+    detail_frame = tk.Frame(main_frame, bg="#000000")
+    detail_frame.pack(side="left", fill="both", expand=True, padx=(10, 0))
+    zone_details = tk.Text(detail_frame, wrap=tk.WORD, font=("Lucida Console", 10), fg="#00FF00", bg="#000000",
+                           insertbackground="#00FF00")
+    zone_details.pack(side="top", fill="both", expand=True)
+    mob_list = tk.Listbox(detail_frame, height=8, font=("Lucida Console", 10), fg="#00FF00", bg="#000000",
+                          selectbackground="#00FF00", selectforeground="#000000", exportselection=False)
+    mob_list.pack(side="top", fill="x", pady=(5, 0))
+
+    zone_names = []
+
+    def refresh_zone_list():
+        zone_names[:] = sorted(zone_state["aggregates"], key=str.lower)
+        zone_list.delete(0, tk.END)
+        for zone in zone_names:
+            zone_list.insert(tk.END, f"{zone} ({zone_state['aggregates'][zone]['count']})")
+
+    def show_zone(event=None):
+        selection = zone_list.curselection()
+        if not selection:
+            return
+        zone = zone_names[selection[0]]
+        agg = zone_state["aggregates"][zone]
+        if agg["level_min"] is None:
+            levels = "Unknown"
+        else:
+            levels = f"{agg['level_min']}-{agg['level_max']} (median {agg['level_median']})"
+        zone_details.config(state=tk.NORMAL)
+        zone_details.delete("1.0", tk.END)
+        zone_details.insert(tk.END, f"Zone: {zone}\n")
+        zone_details.insert(tk.END, f"  Mobs: {agg['count']}\n")
+        zone_details.insert(tk.END, f"  Levels: {levels}\n")
+        zone_details.insert(tk.END, f"  Divinity: {format_histogram(agg['divinity'])}\n")
+        zone_details.insert(tk.END, f"  Type: {format_histogram(agg['type'])}\n")
+        zone_details.insert(tk.END, f"  Pets: {', '.join(agg['pets']) or 'None'}\n")
+        zone_details.insert(tk.END, f"  Loot: {', '.join(agg['loot']) or 'None'}\n")
+        zone_details.config(state=tk.DISABLED)
+        # A zone has no map of its own; drop the button left over from the last mob shown
+        map_button.pack_forget()
+        mob_list.delete(0, tk.END)
+        for name in zone_state["members"][zone]:
+            info = zone_state["mobs"][name]
+            mob_list.insert(tk.END, f"{name.strip()} - Lvl {info.get('Level', '?')} {info.get('Type', '')}")
+
+    def show_mob(event=None):
+        zone_selection = zone_list.curselection()
+        mob_selection = mob_list.curselection()
+        if not zone_selection or not mob_selection:
+            return
+        name = zone_state["members"][zone_names[zone_selection[0]]][mob_selection[0]]
+        info = zone_state["mobs"][name]
+        zone_details.config(state=tk.NORMAL)
+        zone_details.delete("1.0", tk.END)
+        zone_details.insert(tk.END, f"Monster: {name}\n")
+        for k, v in info.items():
+            if k == "Map":
+                continue
+            zone_details.insert(tk.END, f"  {k}: {v}\n")
+        zone_details.config(state=tk.DISABLED)
+        if info.get("Map"):
+            map_button.config(command=lambda: open_map_window(info["Map"]))
+            map_button.pack(side="left", padx=5)
+        else:
+            map_button.pack_forget()
+
+    def reload_zones():
+        # Read the file in the background; the aggregates are updated on the main loop
+        def reloaded(new_mobs):
+            update_zone_aggregates(zone_state["members"], zone_state["aggregates"], zone_state["mobs"], new_mobs)
+            zone_state["mobs"] = new_mobs
+            refresh_zone_list()
+
+        # read_mobs raises on a missing or corrupt file, so the zones are kept and the error shown
+        tasks.run_task(tab_zones, "io", dataloader.read_mobs, on_done=reloaded,
+                       on_error=lambda e: show_message(f"Reload failed: {e}\n"))
+
+    zone_list.bind("<<ListboxSelect>>", show_zone)
+    mob_list.bind("<<ListboxSelect>>", show_mob)
+
+    button_frame = tk.Frame(list_frame, bg="#000000")
+    button_frame.pack(side="top", fill="x", pady=(5, 0))
+    reload_button = tk.Button(button_frame, text="🔄 Reload", bg="#555555", fg="#00FF00", font=("Lucida Console", 10),
+                              command=reload_zones)
+    reload_button.pack(side="left", padx=5)
+    map_button = tk.Button(button_frame, text="Show Map", bg="#00FF00", fg="#000000", font=("Lucida Console", 10))
+
+    def show_message(message):
+        zone_details.config(state=tk.NORMAL)
+        zone_details.delete("1.0", tk.END)
+        zone_details.insert(tk.END, message)
+        zone_details.config(state=tk.DISABLED)
+
+    def on_loaded(dataset):
+        zone_state.update(mobs=dataset["mobs"], members=dataset["zone_members"],
+                          aggregates=dataset["zone_aggregates"])
+        refresh_zone_list()
+        show_message("")
+
+    # Fill in once the background loader has the mob data
+    show_message("Loading zone data...\n")
+    dataloader.when_loaded(
+        tab_zones, "mobs", on_loaded,
+        lambda e: show_message(f"Error loading zone data: {e}\nFile expected at:\n{MOBS_JSON_PATH}\n")
+    )